@@ -0,0 +1,192 @@
+"""
+Micro-benchmarks for the dashboard engines.
+
+    python benchmarks.py             # run everything
+    python benchmarks.py aggregation # run selected benchmarks by name
+
+Each benchmark builds its own synthetic data from the seed generators and
+prints the best of several timed runs.
+"""
+import heapq
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import seed
+from forecast import DemandForecast
+from kitchen_queue import HEAD_START_MINUTES
+from menu import ITEMS_BY_NAME
+from scheduling import PRIORITIES, StaffScheduler
+from schema import ORDER_COLUMNS, apply_schema
+from store import OrderStore
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    BENCHMARKS[func.__name__.removeprefix("bench_")] = func
+    return func
+
+
+def best_time(func, *args, repeat=5):
+    """Best wall-clock time of `repeat` calls, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def synthetic_orders(days=90, orders_per_day=1000):
+    """Order log in the store's schema, `days` calendar days long"""
+    orders = seed.seed_order_history(days=days, orders_per_day=orders_per_day)
+    return apply_schema(orders, ORDER_COLUMNS)
+
+
+@benchmark
+def bench_aggregation():
+    orders = synthetic_orders(days=90)
+    print(f"aggregation: {len(orders):,} orders over one quarter")
+    print(f"  category_summary     {best_time(analytics.category_summary, orders):8.2f} ms")
+    print(f"  latency_percentiles  {best_time(analytics.latency_percentiles, orders):8.2f} ms")
+    print(f"  latency_breakdown    {best_time(analytics.latency_breakdown, orders, 'Hour'):8.2f} ms")
+
+
+@benchmark
+def bench_forecast():
+    orders = synthetic_orders(days=365, orders_per_day=60)
+    now = orders['Placed At'].max()
+    # The last week is folded into a model already fitted on the rest of the year
+    cutoff = now.normalize() - pd.Timedelta(days=7)
+    history = orders[orders['Placed At'] < cutoff]
+    recent = orders[orders['Placed At'] >= cutoff]['Placed At'].dt.floor('h').value_counts()
+    fitted = iter([DemandForecast.from_orders(history, cutoff) for _ in range(5)])
+
+    def update():
+        next(fitted).update(recent.index.values, recent.to_numpy(), now)
+
+    print(f"forecast: {len(orders):,} orders over one year")
+    print(f"  full fit          {best_time(DemandForecast.from_orders, orders, now):8.2f} ms")
+    print(f"  one-week update   {best_time(update):8.2f} ms")
+
+def simulate_kitchen(choose, arrivals, priorities, prep, staff):
+    """ETA in minutes of each order when the `choose` policy picks its cook
+
+    Each cook works their own queue in the kitchen's service order: placement
+    time minus the priority's head start. The policy's assign(work) is called
+    as orders arrive and release(name, work) as they finish.
+    """
+    queues = {name: [] for name in staff}
+    busy_until = dict.fromkeys(staff, 0.0)
+    finished = []
+    eta = np.empty(len(arrivals))
+
+    def advance(name, now):
+        queue = queues[name]
+        while queue and busy_until[name] <= now:
+            _, arrived, order = heapq.heappop(queue)
+            busy_until[name] = max(busy_until[name], arrived) + prep[order]
+            eta[order] = busy_until[name] - arrived
+            heapq.heappush(finished, (busy_until[name], name, order))
+
+    for order, arrived in enumerate(arrivals):
+        for name in staff:
+            advance(name, arrived)
+        while finished and finished[0][0] <= arrived:
+            _, name, done = heapq.heappop(finished)
+            choose.release(name, prep[done])
+        name = choose.assign(prep[order])
+        heapq.heappush(queues[name], (arrived - HEAD_START_MINUTES[priorities[order]], arrived, order))
+        advance(name, arrived)
+    for name in staff:
+        advance(name, np.inf)
+    return eta
+
+
+class RandomAssignment:
+    """Baseline: uniformly random cook, blind to load"""
+
+    def __init__(self, staff, rng):
+        self.staff, self.rng = list(staff), rng
+
+    def assign(self, work):
+        return self.staff[self.rng.integers(len(self.staff))]
+
+    def release(self, name, work):
+        pass
+
+
+@benchmark
+def bench_scheduling():
+    rng = np.random.default_rng(7)
+    staff = ["Maria Santos", "John Martinez", "Alex Rodriguez", "Fatima Ahmed"]
+    # One busy day: four cooks at about 85% utilization over the lunch peak
+    hours = rng.choice(seed.OPENING_HOURS, size=240, p=seed.HOURLY_WEIGHTS / seed.HOURLY_WEIGHTS.sum())
+    arrivals = np.sort(hours * 60 + rng.uniform(0, 60, size=len(hours)))
+    priorities = rng.choice(PRIORITIES, size=len(arrivals), p=[0.2, 0.6, 0.2])
+    prep = rng.uniform(3, 9, size=len(arrivals))
+
+    print(f"scheduling: {len(arrivals)} orders, {len(staff)} cooks")
+    for label, policy in (("random", RandomAssignment(staff, rng)), ("least loaded", StaffScheduler(staff))):
+        eta = simulate_kitchen(policy, arrivals, priorities, prep, staff)
+        print(f"  {label:<16}  mean ETA {eta.mean():6.1f} min   p95 ETA {np.percentile(eta, 95):6.1f} min")
+
+    scheduler = StaffScheduler([f"cook {n}" for n in range(1000)])
+    print(f"  assign x10k, 1000 cooks {best_time(lambda: [scheduler.assign() for _ in range(10_000)]):8.2f} ms")
+
+
+def import_batch(rows, rng):
+    """Queued orders as a bulk CSV import would hand them to the store"""
+    items = rng.choice(list(ITEMS_BY_NAME), size=rows)
+    return pd.DataFrame({
+        "Item": items,
+        "Employee": rng.choice(seed.seed_employees()["Name"].to_numpy(), size=rows),
+        "Status": "queued",
+        "Priority": rng.choice(PRIORITIES, size=rows, p=[0.2, 0.6, 0.2]),
+        "Timestamp": pd.Timestamp.now().strftime("%I:%M %p"),
+        "Cost": [ITEMS_BY_NAME[item].price for item in items],
+        "Message": "",
+        "Rating": 0,
+        "Delivery Method": "Staff",
+    })
+
+
+@benchmark
+def bench_bulk_orders():
+    rng = np.random.default_rng(11)
+    batch = import_batch(10_000, rng)
+    one_by_one = batch.head(1_000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        stores = iter([OrderStore.open(os.path.join(directory, f"bench{n}.db")) for n in range(6)])
+
+        def place_each():
+            store = next(stores)
+            for order in one_by_one.to_dict("records"):
+                store.place_order(order)
+
+        def place_batch():
+            store = next(stores)
+            order_ids = store.place_orders(batch)
+            store.update_orders(order_ids, {'Status': 'preparing'})
+
+        each = best_time(place_each, repeat=3)
+        bulk = best_time(place_batch, repeat=3)
+    print(f"bulk orders: SQLite-backed store seeded with {len(seed.seed_order_history()):,} orders")
+    print(f"  place_order x{len(one_by_one):,}        {each:8.2f} ms  {len(one_by_one) / each * 1000:10,.0f} orders/s")
+    print(f"  place_orders + update_orders {len(batch):,}  {bulk:8.2f} ms  {len(batch) / bulk * 1000:10,.0f} orders/s")
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        sys.exit(f"unknown benchmark(s): {', '.join(unknown)}; choose from {', '.join(BENCHMARKS)}")
+    for name in names:
+        BENCHMARKS[name]()
@@ -0,0 +1,267 @@
+"""
+Append-only columnar table used for the order and feedback logs.
+
+Rows are written into preallocated NumPy arrays that double in size when
+full, so an append costs amortized O(1) instead of the O(n) copy made by
+pd.concat. Categorical columns are stored as integer codes plus a category
+list. The pandas DataFrame is only materialized when a view asks for it and
+is cached until the next write.
+"""
+import numpy as np
+import pandas as pd
+
+CATEGORY_CODE_DTYPE = np.int32
+
+
+class ColumnarLog:
+    """Growable set of NumPy columns with a lazily built DataFrame view
+
+    `dtypes` maps column names to NumPy dtypes, to a pd.CategoricalDtype with
+    a fixed category list, to 'category' for categories learned on append, or
+    to a pandas string dtype ('str'). String columns are held as object
+    arrays and converted to their string dtype in the DataFrame view.
+    """
+
+    def __init__(self, dtypes, capacity=1024):
+        self._dtypes = {}
+        self._categories = {}
+        self._category_codes = {}
+        self._fixed_categories = set()
+        self._capacity = max(int(capacity), 1)
+        self._columns = {}
+        for name, dtype in dtypes.items():
+            if isinstance(dtype, str) and dtype == 'category':
+                dtype = pd.CategoricalDtype()
+            if isinstance(dtype, pd.CategoricalDtype):
+                categories = [] if dtype.categories is None else list(dtype.categories)
+                if dtype.categories is not None:
+                    self._fixed_categories.add(name)
+                self._categories[name] = categories
+                self._category_codes[name] = {value: code for code, value in enumerate(categories)}
+                storage = np.dtype(CATEGORY_CODE_DTYPE)
+            else:
+                dtype = pd.api.types.pandas_dtype(dtype)
+                storage = np.dtype(object) if isinstance(dtype, pd.StringDtype) else dtype
+            self._dtypes[name] = dtype
+            self._columns[name] = np.empty(self._capacity, dtype=storage)
+        self._size = 0
+        self._frame = None
+
+    @classmethod
+    def from_frame(cls, frame, dtypes=None, capacity=1024):
+        """Build a log holding `frame`; categorical columns stay open unless `dtypes` fixes them"""
+        if dtypes is None:
+            dtypes = {
+                name: 'category' if isinstance(frame[name].dtype, pd.CategoricalDtype) else frame[name].dtype
+                for name in frame.columns
+            }
+        log = cls(dtypes, capacity=max(capacity, len(frame)))
+        log.extend(frame)
+        return log
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def columns(self):
+        return list(self._dtypes)
+
+    def _reserve(self, size):
+        """Grow every column geometrically until it can hold `size` rows"""
+        if size <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < size:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        self._capacity = capacity
+
+    # --------------------------------
+    # Category encoding
+    # --------------------------------
+    def _add_category(self, name, value):
+        if name in self._fixed_categories:
+            raise ValueError(f"{value!r} is not a valid {name}")
+        code = len(self._categories[name])
+        self._categories[name].append(value)
+        self._category_codes[name][value] = code
+        return code
+
+    def _encode(self, name, value):
+        if name not in self._categories:
+            return value
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return -1
+        code = self._category_codes[name].get(value)
+        return self._add_category(name, value) if code is None else code
+
+    def _encode_many(self, name, values):
+        if name not in self._categories:
+            return np.asarray(values, dtype=self._columns[name].dtype)
+        values = pd.Series(values).astype(object)
+        for value in pd.unique(values.dropna()):
+            if value not in self._category_codes[name]:
+                self._add_category(name, value)
+        return pd.Categorical(values, categories=self._categories[name]).codes
+
+    def _decode(self, name, stored):
+        if name not in self._categories:
+            return stored
+        return None if stored < 0 else self._categories[name][stored]
+
+
+    # --------------------------------
+    # Writes
+    # --------------------------------
+    def append(self, row):
+        """Append one row given as a column -> value mapping and return its position"""
+        position = self._size
+        self._reserve(position + 1)
+        for name, column in self._columns.items():
+            column[position] = self._encode(name, row[name])
+        self._size = position + 1
+        self._frame = None
+        return position
+
+    def extend(self, frame):
+        """Append every row of a DataFrame (or mapping of equal-length arrays)"""
+        count = len(frame[self.columns[0]]) if self._dtypes else 0
+        start = self._size
+        self._reserve(start + count)
+        for name, column in self._columns.items():
+            column[start:start + count] = self._encode_many(name, frame[name])
+        self._size = start + count
+        self._frame = None
+        return range(start, start + count)
+
+    def set(self, position, name, value):
+        """Overwrite a single cell in place"""
+        if not 0 <= position < self._size:
+            raise IndexError(position)
+        self._columns[name][position] = self._encode(name, value)
+        self._frame = None
+
+    def set_many(self, positions, name, values):
+        """Overwrite one column at many positions with a value per position"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(positions) and not (0 <= positions.min() and positions.max() < self._size):
+            raise IndexError(positions)
+        self._columns[name][positions] = self._encode_many(name, values)
+        self._frame = None
+
+    # --------------------------------
+    # Reads
+    # --------------------------------
+    def get(self, position, name):
+        return self._decode(name, self._columns[name][position])
+
+    def column(self, name):
+        """Read-only view of the stored values (category codes for categorical columns)"""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def take(self, positions, names=None):
+        """Rows at `positions` as a column -> NumPy array mapping, optionally only the columns `names`
+
+        Categorical columns come back as object arrays of their values, None
+        where missing. Unlike frame() this costs no pandas construction, so it
+        suits the handful of rows an order event touches.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        taken = {}
+        for name in (self.columns if names is None else names):
+            stored = self._columns[name][positions]
+            if name in self._categories:
+                # Code -1 indexes the trailing None
+                stored = np.array(self._categories[name] + [None], dtype=object)[stored]
+            taken[name] = stored
+        return taken
+
+    def _materialize(self, name):
+        values = self._columns[name][:self._size].copy()
+        if isinstance(self._dtypes[name], pd.StringDtype):
+            return pd.array(values, dtype=self._dtypes[name])
+        if name not in self._categories:
+            return values
+        dtype = self._dtypes[name]
+        return pd.Categorical.from_codes(values, categories=list(self._categories[name]), ordered=bool(dtype.ordered))
+
+    def frame(self):
+        """Materialize the log as a DataFrame, reusing the cached copy when unchanged"""
+        if self._frame is None:
+            self._frame = pd.DataFrame({name: self._materialize(name) for name in self._columns}, columns=self.columns)
+        return self._frame
+
+
+class SortedIndex:
+    """Log positions ordered by a key column, kept sorted as rows are appended
+
+    Keys are held in a growable sorted array beside the positions they
+    belong to. A key at or past the current maximum is appended in amortized
+    O(1); an earlier one is inserted with one O(n) shift, and a batch that
+    does not continue the order is merged with a stable sort.
+    """
+
+    def __init__(self, keys=(), capacity=1024):
+        keys = np.asarray(keys)
+        order = np.argsort(keys, kind='stable')
+        self._capacity = max(int(capacity), len(keys), 1)
+        self._keys = np.empty(self._capacity, dtype=keys.dtype)
+        self._positions = np.empty(self._capacity, dtype=np.int64)
+        self._size = len(keys)
+        self._keys[:self._size] = keys[order]
+        self._positions[:self._size] = order
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, size):
+        if size <= self._capacity:
+            return
+        capacity = self._capacity
+        while capacity < size:
+            capacity *= 2
+        for name in ('_keys', '_positions'):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    def insert(self, key, position):
+        """Index one row; equal keys keep their insertion order"""
+        size = self._size
+        self._reserve(size + 1)
+        at = int(np.searchsorted(self._keys[:size], key, side='right'))
+        # Shift the tail one slot right (a no-op for the usual append at the end)
+        self._keys[at + 1:size + 1] = self._keys[at:size]
+        self._positions[at + 1:size + 1] = self._positions[at:size]
+        self._keys[at] = key
+        self._positions[at] = position
+        self._size = size + 1
+
+    def extend(self, keys, positions):
+        """Index a batch of rows"""
+        keys = np.asarray(keys)
+        positions = np.asarray(positions, dtype=np.int64)
+        size = self._size
+        self._reserve(size + len(keys))
+        self._keys[size:size + len(keys)] = keys
+        self._positions[size:size + len(keys)] = positions
+        self._size = size + len(keys)
+        in_order = len(keys) < 2 or bool(np.all(keys[1:] >= keys[:-1]))
+        if size and len(keys) and keys[0] < self._keys[size - 1]:
+            in_order = False
+        if not in_order:
+            order = np.argsort(self._keys[:self._size], kind='stable')
+            self._keys[:self._size] = self._keys[:self._size][order]
+            self._positions[:self._size] = self._positions[:self._size][order]
+
+    def since(self, key):
+        """Positions of the rows whose key is at or after `key`, in key order"""
+        first = int(np.searchsorted(self._keys[:self._size], key, side='left'))
+        return self._positions[first:self._size].copy()
@@ -0,0 +1,71 @@
+"""
+Order ETA estimates for the kitchen queue.
+
+Each menu item starts from the catalog's prep time and is refined with an
+exponentially weighted moving average of the prep times the kitchen actually
+takes. A cook works their preparing orders first and then their queue in
+service order, so an order's ETA is the remaining prep time of everything
+ahead of it at that cook plus its own. The store recomputes ETAs one cook at
+a time, only for the cook whose queue just changed.
+"""
+import math
+from datetime import datetime
+
+import numpy as np
+
+from menu import MENU_ITEMS
+from schema import epoch_seconds
+
+# Weight of the newest observed prep time in an item's estimate
+PREP_SMOOTHING = 0.2
+DEFAULT_PREP_MINUTES = 5
+# Observations outside this range are treated as forgotten clicks, not prep times
+MIN_OBSERVED_MINUTES = 0.5
+MAX_OBSERVED_MINUTES = 90
+
+
+class EtaEstimator:
+    """Per-item prep time estimates and queue ETAs derived from them"""
+
+    def __init__(self, smoothing=PREP_SMOOTHING):
+        self.smoothing = smoothing
+        self.prep = {item.name: float(item.prep_minutes) for item in MENU_ITEMS}
+
+    @classmethod
+    def from_orders(cls, orders_df, smoothing=PREP_SMOOTHING):
+        """Estimator seeded with each item's median prep time over the delivered orders"""
+        estimator = cls(smoothing)
+        prep = (orders_df['Delivered At'] - orders_df['Started At']) / 60
+        timed = prep.between(MIN_OBSERVED_MINUTES, MAX_OBSERVED_MINUTES).to_numpy()
+        medians = prep[timed].groupby(orders_df['Item'][timed], observed=True).median()
+        estimator.prep.update({item: float(minutes) for item, minutes in medians.items() if np.isfinite(minutes)})
+        return estimator
+
+    def prep_minutes(self, item):
+        """Current prep time estimate of a menu item"""
+        return self.prep.get(item, DEFAULT_PREP_MINUTES)
+
+    def observe(self, item, minutes):
+        """Fold a measured prep time into the item's estimate"""
+        if not MIN_OBSERVED_MINUTES <= minutes <= MAX_OBSERVED_MINUTES:
+            return
+        estimate = self.prep_minutes(item)
+        self.prep[item] = estimate + self.smoothing * (minutes - estimate)
+
+    def queue_etas(self, orders, now=None):
+        """ETA in whole minutes of each order in one cook's queue
+
+        `orders` are (item, status, started_at) tuples in the order the cook
+        will work them; started_at is the 'Started At' epoch of a preparing
+        order, NaN if unknown.
+        """
+        now = epoch_seconds(now or datetime.now())
+        ahead = 0.0
+        etas = []
+        for item, status, started_at in orders:
+            prep = self.prep_minutes(item)
+            if status == 'preparing' and not math.isnan(started_at):
+                prep = max(prep - (now - started_at) / 60, 1)
+            ahead += prep
+            etas.append(math.ceil(ahead))
+        return etas
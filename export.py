@@ -0,0 +1,27 @@
+"""
+Chunked, gzip-compressed CSV exports of the store's tables.
+
+A table is rendered to CSV CHUNK_ROWS rows at a time and each chunk goes
+straight into a gzip stream, so an export holds one chunk of CSV text and
+the compressed output, never the whole uncompressed file.
+"""
+import gzip
+import io
+
+CHUNK_ROWS = 20_000
+
+
+def csv_chunks(frame, chunk_rows=CHUNK_ROWS):
+    """CSV text of a DataFrame in slices of `chunk_rows` rows; the header comes with the first"""
+    for start in range(0, max(len(frame), 1), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows].to_csv(index=False, header=start == 0)
+
+
+def gzip_csv(frame, chunk_rows=CHUNK_ROWS, compresslevel=6):
+    """A DataFrame as gzip-compressed UTF-8 CSV bytes, compressed chunk by chunk"""
+    buffer = io.BytesIO()
+    # A fixed mtime keeps the output identical for identical data
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=compresslevel, mtime=0) as archive:
+        for chunk in csv_chunks(frame, chunk_rows):
+            archive.write(chunk.encode("utf-8"))
+    return buffer.getvalue()
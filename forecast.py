@@ -0,0 +1,89 @@
+"""
+Hourly demand forecast for the admin dashboard.
+
+Orders follow a weekly rhythm, so the forecast keeps one exponentially
+smoothed level per (weekday, hour) slot. Each completed hour of order counts
+updates its slot once; update() only folds in the hours completed since the
+previous call, so keeping the model current costs O(new hours).
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+# Weight of the newest week in each slot's level
+SMOOTHING = 0.3
+# Orders one kitchen staff member can prepare per hour
+ORDERS_PER_STAFF_HOUR = 12
+
+HOURS_PER_WEEK = 7 * 24
+# 1970-01-01, day zero of datetime64, was a Thursday
+EPOCH_WEEKDAY = 3
+
+
+def _weekly_slot(hours):
+    """(weekday, hour) slot of datetime64[h] values, numbered 0..167 from Monday 00:00"""
+    hours = np.asarray(hours, dtype='datetime64[h]').astype(np.int64)
+    return ((hours // 24 + EPOCH_WEEKDAY) % 7) * 24 + hours % 24
+
+
+def staff_needed(orders_per_hour, orders_per_staff_hour=ORDERS_PER_STAFF_HOUR):
+    """Kitchen staff required to keep up with an hourly order rate"""
+    return max(1, math.ceil(orders_per_hour / orders_per_staff_hour))
+
+
+class DemandForecast:
+    """Exponentially smoothed order count per weekday and hour of day"""
+
+    def __init__(self, smoothing=SMOOTHING):
+        self.smoothing = smoothing
+        self.level = np.full(HOURS_PER_WEEK, np.nan)
+        self.weeks = np.zeros(HOURS_PER_WEEK, dtype=np.int64)
+        # First hour not yet folded in
+        self.through = None
+
+    @classmethod
+    def from_orders(cls, orders_df, until, smoothing=SMOOTHING):
+        """Fit on the hourly order counts of an orders frame, up to the hour containing `until`"""
+        hours = orders_df['Placed At'].to_numpy().astype('datetime64[h]')
+        forecast = cls(smoothing)
+        if len(hours):
+            forecast.through = hours.min().astype('datetime64[D]').astype('datetime64[h]')
+            slots, counts = np.unique(hours, return_counts=True)
+            forecast.update(slots, counts, until)
+        return forecast
+
+    def update(self, hours, counts, until):
+        """Fold in every complete hour from the last update to the hour containing `until`
+
+        `hours` and `counts` give the orders per hour; hours not listed had none.
+        """
+        until = pd.Timestamp(until).to_datetime64().astype('datetime64[h]')
+        if self.through is None:
+            self.through = until
+        start = self.through
+        if start >= until:
+            return
+        span = int((until - start).astype(np.int64))
+        offset = (np.asarray(hours, dtype='datetime64[h]') - start).astype(np.int64)
+        counted = (offset >= 0) & (offset < span)
+        series = np.bincount(offset[counted], weights=np.asarray(counts, dtype=np.float64)[counted],
+                             minlength=span)
+
+        # Lay the hours out as rows of whole weeks so each row updates all 168 slots at once
+        lead = int(_weekly_slot(start))
+        weeks = np.full(-(-(lead + span) // HOURS_PER_WEEK) * HOURS_PER_WEEK, np.nan)
+        weeks[lead:lead + span] = series
+        for week in weeks.reshape(-1, HOURS_PER_WEEK):
+            observed = ~np.isnan(week)
+            first = observed & np.isnan(self.level)
+            later = observed & ~first
+            self.level[first] = week[first]
+            self.level[later] += self.smoothing * (week[later] - self.level[later])
+            self.weeks += observed
+        self.through = until
+
+    def predict_day(self, day):
+        """Expected orders for each hour of `day`"""
+        weekday = pd.Timestamp(day).weekday()
+        return np.nan_to_num(self.level[weekday * 24:(weekday + 1) * 24])
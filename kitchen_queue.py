@@ -0,0 +1,103 @@
+"""
+Priority queue of the orders the kitchen still has to work.
+
+An order's service key is its placement time minus a head start for its
+priority, so a high-priority order jumps ahead of normal orders placed up to
+HEAD_START_MINUTES earlier, but never ahead of ones that have waited longer
+than that. Keys never change while an order waits, which makes aging free:
+every order eventually reaches the front no matter what arrives after it.
+
+Entries live in a binary heap with lazy deletion, so push is O(log n). A
+page of the queue is read by walking the heap best-first from the root: the
+first k orders cost O(k log k) rather than a sort of the whole queue, and a
+later page also re-walks the entries before its cursor.
+"""
+import heapq
+from collections import Counter
+
+import pandas as pd
+
+HEAD_START_MINUTES = {'high': 10, 'normal': 5, 'low': 0}
+
+
+def queue_key(priority, placed_at):
+    """Service key of an order: placement time in epoch seconds minus its priority's head start"""
+    return pd.Timestamp(placed_at).value // 10**9 - HEAD_START_MINUTES.get(priority, 0) * 60
+
+
+class KitchenQueue:
+    """Outstanding orders in service order, with per status/priority counts"""
+
+    def __init__(self):
+        self._heap = []
+        # Order ID -> (heap entry, status, priority) for every live order
+        self._entries = {}
+        self._counts = Counter()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, order_id):
+        return order_id in self._entries
+
+    def key(self, order_id):
+        """Position of a queued order in service order, comparable across orders"""
+        return self._entries[order_id][0]
+
+    def push(self, order_id, status, priority, placed_at):
+        """Add an order, or update the status or priority of one already queued"""
+        entry = (queue_key(priority, placed_at), order_id)
+        if order_id in self._entries:
+            old_entry, old_status, old_priority = self._entries[order_id]
+            self._counts[old_status, old_priority] -= 1
+            if old_entry != entry:
+                heapq.heappush(self._heap, entry)
+        else:
+            heapq.heappush(self._heap, entry)
+        self._entries[order_id] = (entry, status, priority)
+        self._counts[status, priority] += 1
+
+    def remove(self, order_id):
+        """Drop an order; its heap entry goes stale until the heap is compacted"""
+        entry = self._entries.pop(order_id, None)
+        if entry is None:
+            return
+        self._counts[entry[1], entry[2]] -= 1
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [live[0] for live in self._entries.values()]
+            heapq.heapify(self._heap)
+
+    def _is_live(self, entry):
+        live = self._entries.get(entry[1])
+        return live is not None and live[0] == entry
+
+    def page(self, statuses, priorities, after=None, limit=10):
+        """Order IDs of the next `limit` matching orders after the cursor `after`
+
+        Returns the IDs, the cursor of the last one and whether more follow.
+        The heap is walked best-first from the root, expanding only the nodes
+        popped. Nothing past the requested page is visited, but every entry
+        up to the cursor is, so page p of size k costs O(pk log pk).
+        """
+        statuses, priorities = set(statuses), set(priorities)
+        frontier = [(self._heap[0], 0)] if self._heap else []
+        page, seen = [], set()
+        while frontier and len(page) <= limit:
+            entry, index = heapq.heappop(frontier)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self._heap):
+                    heapq.heappush(frontier, (self._heap[child], child))
+            # An order removed and re-queued with the same key can appear twice
+            if not self._is_live(entry) or entry in seen or (after is not None and entry <= after):
+                continue
+            seen.add(entry)
+            _, status, priority = self._entries[entry[1]]
+            if status in statuses and priority in priorities:
+                page.append(entry)
+        has_more = len(page) > limit
+        page = page[:limit]
+        return [order_id for _, order_id in page], (page[-1] if page else after), has_more
+
+    def count(self, statuses, priorities):
+        """Number of queued orders with one of `statuses` and one of `priorities`"""
+        return sum(self._counts[status, priority] for status in statuses for priority in priorities)
@@ -0,0 +1,52 @@
+"""
+Cafeteria menu catalog.
+
+The menu is declared once here and indexed at import time, so every session
+in the process shares the same immutable catalog and looks items up by ID,
+name or category in O(1).
+"""
+from collections import namedtuple
+from types import MappingProxyType
+
+# prep_minutes is the kitchen's starting estimate; the ETA estimator refines it from real orders
+MenuItem = namedtuple("MenuItem", [
+    "item_id", "name", "category", "price", "description", "popular", "prep_minutes",
+])
+
+CATEGORY_ICONS = MappingProxyType({
+    "Beverages": "☕",
+    "Main Course": "🍔",
+    "Snacks": "🍟",
+    "Desserts": "🍰",
+})
+
+MENU_ITEMS = (
+    MenuItem(1, "Espresso", "Beverages", 4.50, "Strong Italian coffee", True, 2),
+    MenuItem(2, "Cappuccino", "Beverages", 5.00, "Espresso with steamed milk foam", True, 3),
+    MenuItem(3, "Latte", "Beverages", 4.75, "Smooth coffee with milk", False, 3),
+    MenuItem(4, "Green Tea", "Beverages", 3.50, "Refreshing herbal tea", False, 2),
+    MenuItem(5, "Matcha Latte", "Beverages", 5.50, "Japanese green tea latte", True, 4),
+    MenuItem(6, "Club Sandwich", "Main Course", 8.99, "Triple-decker classic", True, 8),
+    MenuItem(7, "Burger Deluxe", "Main Course", 12.99, "Premium beef burger", True, 12),
+    MenuItem(8, "Pasta Primavera", "Main Course", 11.99, "Fresh vegetable pasta", False, 11),
+    MenuItem(9, "Caesar Salad", "Main Course", 9.50, "Classic Caesar with chicken", False, 6),
+    MenuItem(10, "French Fries", "Snacks", 4.00, "Crispy golden fries", True, 6),
+    MenuItem(11, "Nachos", "Snacks", 6.50, "Cheese nachos with salsa", False, 5),
+    MenuItem(12, "Spring Rolls", "Snacks", 7.00, "Vegetable spring rolls", False, 7),
+    MenuItem(13, "Chocolate Cake", "Desserts", 6.00, "Rich chocolate layer cake", True, 2),
+    MenuItem(14, "Ice Cream", "Desserts", 4.50, "Vanilla or chocolate", False, 1),
+    MenuItem(15, "Fruit Salad", "Desserts", 5.50, "Fresh seasonal fruits", False, 3),
+)
+
+CATEGORIES = tuple(CATEGORY_ICONS)
+ITEMS_BY_ID = MappingProxyType({item.item_id: item for item in MENU_ITEMS})
+ITEMS_BY_NAME = MappingProxyType({item.name: item for item in MENU_ITEMS})
+ITEMS_BY_CATEGORY = MappingProxyType({
+    category: tuple(item for item in MENU_ITEMS if item.category == category) for category in CATEGORIES
+})
+
+
+def item_label(item_id):
+    """Selectbox label for a menu item"""
+    item = ITEMS_BY_ID[item_id]
+    return f"{item.name} - ${item.price:.2f}"
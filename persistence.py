@@ -0,0 +1,322 @@
+"""
+SQLite persistence for the order store.
+
+The database runs in WAL mode so dashboard reads never block the writer.
+Writes are queued as parameterized statements and committed in batches:
+either when `batch_size` statements are pending or `flush_interval` seconds
+after the first one, whichever comes first, and once more at exit.
+"""
+import atexit
+import itertools
+import math
+import sqlite3
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Bump whenever a table layout below changes, and add the step that upgrades
+# older files to MIGRATIONS; existing data is never dropped.
+SCHEMA_VERSION = 5
+
+# table -> [(DataFrame column, SQL column, SQL type)]
+TABLES = {
+    "orders": [
+        ("Order ID", "order_id", "INTEGER PRIMARY KEY"),
+        ("Item", "item", "TEXT"),
+        ("Employee", "employee", "TEXT"),
+        ("Status", "status", "TEXT"),
+        ("Priority", "priority", "TEXT"),
+        ("ETA (min)", "eta_min", "INTEGER"),
+        ("Timestamp", "timestamp", "TEXT"),
+        ("Cost", "cost", "REAL"),
+        ("Assigned Staff", "assigned_staff", "TEXT"),
+        ("Message", "message", "TEXT"),
+        ("Rating", "rating", "INTEGER"),
+        ("Delivery Method", "delivery_method", "TEXT"),
+        ("Placed At", "placed_at", "TIMESTAMP"),
+        ("Started At", "started_at", "REAL"),
+        ("Delivered At", "delivered_at", "REAL"),
+    ],
+    "employees": [
+        ("Employee ID", "employee_id", "TEXT PRIMARY KEY"),
+        ("Name", "name", "TEXT"),
+        ("Department", "department", "TEXT"),
+        ("Position", "position", "TEXT"),
+        ("Priority Level", "priority_level", "TEXT"),
+        ("Email", "email", "TEXT"),
+        ("Phone", "phone", "TEXT"),
+        ("Join Date", "join_date", "TEXT"),
+    ],
+    "kitchen_staff": [
+        ("Staff ID", "staff_id", "TEXT PRIMARY KEY"),
+        ("Name", "name", "TEXT"),
+        ("Role", "role", "TEXT"),
+        ("Shift", "shift", "TEXT"),
+        ("Status", "status", "TEXT"),
+        ("Leave Start", "leave_start", "TEXT"),
+        ("Leave End", "leave_end", "TEXT"),
+        ("Coverage By", "coverage_by", "TEXT"),
+        ("Email", "email", "TEXT"),
+        ("Phone", "phone", "TEXT"),
+        ("Join Date", "join_date", "TEXT"),
+        ("Performance Rating", "performance_rating", "REAL"),
+    ],
+    "inventory": [
+        ("Item", "item", "TEXT PRIMARY KEY"),
+        ("Stock Level", "stock_level", "REAL"),
+        ("Unit", "unit", "TEXT"),
+        ("Threshold", "threshold", "INTEGER"),
+        ("Status", "status", "TEXT"),
+        ("Last Order", "last_order", "TIMESTAMP"),
+    ],
+    "feedback": [
+        ("Employee", "employee", "TEXT"),
+        ("Staff Member", "staff_member", "TEXT"),
+        ("Rating", "rating", "INTEGER"),
+        ("Comment", "comment", "TEXT"),
+        ("Date", "date", "TEXT"),
+    ],
+}
+
+INDEXES = {
+    "orders": ["employee", "status", "assigned_staff", "placed_at"],
+    "employees": ["name"],
+    "feedback": ["staff_member"],
+}
+
+# Feedback has no natural key, so rows keep SQLite's rowid for stable ordering
+ORDER_BY = {
+    "orders": "order_id",
+    "employees": "rowid",
+    "kitchen_staff": "rowid",
+    "inventory": "rowid",
+    "feedback": "rowid",
+}
+
+
+def _sql_value(value):
+    """Convert NumPy scalars, timestamps and NaN into values sqlite3 can bind"""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _sql_column(table, column):
+    for frame_column, sql_column, _ in TABLES[table]:
+        if frame_column == column:
+            return sql_column
+    raise KeyError(f"{table} has no column {column!r}")
+
+
+# --------------------------------
+# Migrations
+# --------------------------------
+def _add_placed_at(conn):
+    """v2: orders gain placed_at. Version 1 kept only the time of day, so old orders are dated today"""
+    conn.execute("ALTER TABLE orders ADD COLUMN placed_at TIMESTAMP")
+    orders = pd.read_sql_query("SELECT order_id, timestamp FROM orders", conn)
+    times = pd.to_datetime(orders['timestamp'], format="%I:%M %p", errors="coerce")
+    placed_at = pd.Timestamp.now().normalize() + (times - times.dt.normalize()).fillna(pd.Timedelta(0))
+    conn.executemany(
+        "UPDATE orders SET placed_at = ? WHERE order_id = ?",
+        [(_sql_value(value), int(order_id)) for value, order_id in zip(placed_at, orders['order_id'])],
+    )
+
+
+def _add_lifecycle_times(conn):
+    """v3: orders gain started_at/delivered_at; older orders have no recorded transitions"""
+    conn.execute("ALTER TABLE orders ADD COLUMN started_at REAL")
+    conn.execute("ALTER TABLE orders ADD COLUMN delivered_at REAL")
+
+
+def _last_order_dates(values):
+    """Dates from the free-text Last Order of version 4 and earlier ('Today', '2 days ago')"""
+    text = values.astype(str).str.strip().str.lower()
+    days_ago = text.str.extract(r"(\d+)\s+days?\s+ago", expand=False).astype(float)
+    days_ago = days_ago.mask(text == "today", 0).mask(text == "yesterday", 1)
+    dates = pd.to_datetime(values, format="ISO8601", errors="coerce")
+    return dates.fillna(pd.Timestamp.now().normalize() - pd.to_timedelta(days_ago, unit="D"))
+
+
+def _retype_inventory(conn):
+    """v4/v5: stock_level becomes REAL and last_order a TIMESTAMP
+
+    SQLite cannot change a column's type, so the table is copied into a new
+    one with the current layout.
+    """
+    inventory = pd.read_sql_query("SELECT * FROM inventory ORDER BY rowid", conn)
+    inventory['last_order'] = _last_order_dates(inventory['last_order'])
+    conn.execute("ALTER TABLE inventory RENAME TO inventory_old")
+    conn.execute(Database._create_sql("inventory"))
+    sql_columns = [sql_column for _, sql_column, _ in TABLES["inventory"]]
+    conn.executemany(
+        f"INSERT INTO inventory ({', '.join(sql_columns)}) VALUES ({', '.join('?' for _ in sql_columns)})",
+        [tuple(_sql_value(value) for value in row) for row in inventory[sql_columns].itertuples(index=False)],
+    )
+    conn.execute("DROP TABLE inventory_old")
+
+
+# (schema version reached, upgrade step); one inventory rebuild covers both v4 and v5
+MIGRATIONS = (
+    (2, _add_placed_at),
+    (3, _add_lifecycle_times),
+    (5, _retype_inventory),
+)
+
+
+class Database:
+    """Write-behind SQLite backend for OrderStore"""
+
+    def __init__(self, path, batch_size=50, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = []
+        self._timer = None
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _create_sql(table):
+        definition = ", ".join(f"{sql_column} {sql_type}" for _, sql_column, sql_type in TABLES[table])
+        return f"CREATE TABLE IF NOT EXISTS {table} ({definition})"
+
+    def _create_schema(self):
+        """Create missing tables and upgrade files written by an older schema version in place"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"{self.path} has schema version {version}, newer than this app's {SCHEMA_VERSION}"
+            )
+        with self._conn:
+            # Version 0 is a new file: the tables below are created at the current layout
+            if version > 0:
+                # One transaction, so a failed upgrade leaves the file at its old version
+                self._conn.execute("BEGIN")
+                for reached, migrate in MIGRATIONS:
+                    if version < reached:
+                        migrate(self._conn)
+            for table in TABLES:
+                self._conn.execute(self._create_sql(table))
+                for sql_column in INDEXES.get(table, []):
+                    self._conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{table}_{sql_column} ON {table} ({sql_column})"
+                    )
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 0
+
+    # --------------------------------
+    # Bulk load / save
+    # --------------------------------
+    def load_tables(self):
+        """Read every table back as a DataFrame with the dashboard's column names"""
+        tables = {}
+        with self._lock:
+            for table, columns in TABLES.items():
+                sql_columns = ", ".join(sql_column for _, sql_column, _ in columns)
+                frame = pd.read_sql_query(
+                    f"SELECT {sql_columns} FROM {table} ORDER BY {ORDER_BY[table]}", self._conn
+                )
+                frame.columns = [frame_column for frame_column, _, _ in columns]
+                for frame_column, _, sql_type in columns:
+                    if sql_type == "TIMESTAMP":
+                        # Seed rows are whole seconds, app writes carry microseconds
+                        frame[frame_column] = pd.to_datetime(frame[frame_column], format="ISO8601")
+                tables[table] = frame
+        return tables
+
+    def save_tables(self, tables):
+        """Replace table contents in a single transaction"""
+        with self._lock:
+            self._flush_locked()
+            with self._conn:
+                for table, frame in tables.items():
+                    self._conn.execute(f"DELETE FROM {table}")
+                    self._conn.executemany(self._insert_sql(table), self._rows(table, frame))
+
+    @staticmethod
+    def _insert_sql(table):
+        sql_columns = [sql_column for _, sql_column, _ in TABLES[table]]
+        placeholders = ", ".join("?" for _ in sql_columns)
+        return f"INSERT INTO {table} ({', '.join(sql_columns)}) VALUES ({placeholders})"
+
+    @staticmethod
+    def _rows(table, frame):
+        columns = [frame_column for frame_column, _, _ in TABLES[table]]
+        for values in zip(*(frame[column] for column in columns)):
+            yield tuple(_sql_value(value) for value in values)
+
+    # --------------------------------
+    # Queued writes
+    # --------------------------------
+    def insert(self, table, row):
+        """Queue an INSERT of one row given as a column -> value mapping"""
+        params = tuple(_sql_value(row[frame_column]) for frame_column, _, _ in TABLES[table])
+        self._enqueue_many([(self._insert_sql(table), params)])
+
+    def insert_many(self, table, frame):
+        """Queue an INSERT of every row of a DataFrame as one batch"""
+        self._enqueue_many([(self._insert_sql(table), params) for params in self._rows(table, frame)])
+
+    @staticmethod
+    def _update_statement(table, key_column, key, changes):
+        columns = sorted(changes)
+        assignments = ", ".join(f"{_sql_column(table, column)} = ?" for column in columns)
+        sql = f"UPDATE {table} SET {assignments} WHERE {_sql_column(table, key_column)} = ?"
+        return sql, tuple(_sql_value(changes[column]) for column in columns) + (_sql_value(key),)
+
+    def update(self, table, key_column, key, changes):
+        """Queue an UPDATE of the row whose `key_column` equals `key`"""
+        self._enqueue_many([self._update_statement(table, key_column, key, changes)])
+
+    def update_many(self, table, key_column, updates):
+        """Queue UPDATEs for (key, changes) pairs as one batch"""
+        self._enqueue_many([self._update_statement(table, key_column, key, changes) for key, changes in updates])
+
+    def _enqueue_many(self, statements):
+        """Queue (sql, params) statements; a batch larger than batch_size is committed as one transaction"""
+        if not statements:
+            return
+        with self._lock:
+            self._pending.extend(statements)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Commit every queued statement in one transaction"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        with self._conn:
+            # Consecutive statements with the same SQL go through one executemany
+            for sql, group in itertools.groupby(self._pending, key=lambda entry: entry[0]):
+                self._conn.executemany(sql, [params for _, params in group])
+        self._pending.clear()
@@ -0,0 +1,55 @@
+"""
+Bill of materials linking menu items to inventory ingredients.
+
+RECIPES lists how much of each ingredient (in the inventory's unit) one
+serving of a menu item uses. consumption() turns any batch of delivered
+items into total usage per inventory row with two np.bincount calls over the
+recipe rows, so the cost grows with the recipe table, not with the size of
+the batch or the number of SKUs in stock.
+"""
+import numpy as np
+import pandas as pd
+
+from menu import MENU_ITEMS
+
+# (menu item, ingredient, quantity per serving)
+RECIPES = (
+    ("Espresso", "Coffee Beans", 0.018),
+    ("Cappuccino", "Coffee Beans", 0.018),
+    ("Cappuccino", "Milk", 0.15),
+    ("Latte", "Coffee Beans", 0.018),
+    ("Latte", "Milk", 0.25),
+    ("Green Tea", "Tea Leaves", 0.005),
+    ("Matcha Latte", "Tea Leaves", 0.004),
+    ("Matcha Latte", "Milk", 0.25),
+    ("Club Sandwich", "Bread", 0.25),
+    ("Club Sandwich", "Vegetables", 0.05),
+    ("Burger Deluxe", "Bread", 0.2),
+    ("Burger Deluxe", "Vegetables", 0.05),
+    ("Pasta Primavera", "Vegetables", 0.15),
+    ("Caesar Salad", "Vegetables", 0.2),
+    ("Caesar Salad", "Bread", 0.05),
+    ("French Fries", "Vegetables", 0.2),
+    ("Spring Rolls", "Vegetables", 0.1),
+    ("Chocolate Cake", "Milk", 0.05),
+    ("Ice Cream", "Milk", 0.1),
+)
+
+ITEM_INDEX = {item.name: index for index, item in enumerate(MENU_ITEMS)}
+RECIPE_ITEMS = np.array([ITEM_INDEX[item] for item, _, _ in RECIPES], dtype=np.int64)
+RECIPE_INGREDIENTS = pd.Index([ingredient for _, ingredient, _ in RECIPES])
+RECIPE_QUANTITIES = np.array([quantity for _, _, quantity in RECIPES])
+
+
+def servings(items):
+    """Servings per menu item (in MENU_ITEMS order) in a batch of item names"""
+    codes = pd.Series(items, dtype=object).map(ITEM_INDEX).dropna().to_numpy(dtype=np.int64)
+    return np.bincount(codes, minlength=len(MENU_ITEMS))
+
+
+def consumption(items, ingredients):
+    """Quantity of each of `ingredients` (inventory item names) used by a batch of menu items"""
+    target = pd.Index(ingredients).get_indexer(RECIPE_INGREDIENTS)
+    stocked = target >= 0
+    used = RECIPE_QUANTITIES * servings(items)[RECIPE_ITEMS]
+    return np.bincount(target[stocked], weights=used[stocked], minlength=len(ingredients))
@@ -0,0 +1,132 @@
+"""
+Menu recommendations mined from the order log.
+
+RecommendationModel is built in one vectorized pass over the orders: an
+employee x item count matrix, the item x item co-occurrence matrix derived
+from it, item popularity per hour of day and item demand over the last week
+against the weeks before. Serving an employee is then a few lookups and dot
+products over the menu's handful of items.
+"""
+import numpy as np
+import pandas as pd
+
+from menu import MENU_ITEMS
+
+ITEM_NAMES = tuple(item.name for item in MENU_ITEMS)
+ITEM_CATEGORIES = np.array([item.category for item in MENU_ITEMS])
+ITEM_INDEX = {name: index for index, name in enumerate(ITEM_NAMES)}
+
+# "Trending" compares the share of orders over the last week with the four weeks before
+TRENDING_DAYS = 7
+BASELINE_DAYS = 28
+POSITIVE_RATING = 4
+
+
+def _codes(series, index=None):
+    """Integer codes of a column, plus its distinct values; -1 marks values outside `index`"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, values = series.cat.codes.to_numpy().astype(np.int64), series.cat.categories
+    else:
+        codes, values = pd.factorize(series)
+    if index is None:
+        return codes, values
+    # The trailing -1 maps missing values (code -1) to "unknown" as well
+    lookup = np.array([index.get(value, -1) for value in values] + [-1], dtype=np.int64)
+    return lookup[codes], values
+
+
+class RecommendationModel:
+    """Item affinity, co-occurrence, hourly popularity and trend for one snapshot of orders"""
+
+    def __init__(self, orders_df, now=None):
+        n_items = len(ITEM_NAMES)
+        item, _ = _codes(orders_df['Item'], ITEM_INDEX)
+        employee, employees = _codes(orders_df['Employee'])
+        placed_at = orders_df['Placed At'].to_numpy()
+        known = (item >= 0) & (employee >= 0)
+        item, employee, placed_at = item[known], employee[known], placed_at[known]
+        rating = orders_df['Rating'].to_numpy()[known]
+
+        self.employee_rows = {name: row for row, name in enumerate(employees)}
+        # Orders per (employee, item), flattened into one bincount
+        self.affinity = np.bincount(
+            employee * n_items + item, minlength=len(employees) * n_items
+        ).reshape(len(employees), n_items)
+        # Number of employees who ordered both items
+        ordered = (self.affinity > 0).astype(np.float64)
+        self.co_occurrence = ordered.T @ ordered
+        np.fill_diagonal(self.co_occurrence, 0)
+
+        hour = (placed_at.astype('datetime64[h]') - placed_at.astype('datetime64[D]')).astype(np.int64)
+        self.hourly = np.bincount(hour * n_items + item, minlength=24 * n_items).reshape(24, n_items)
+
+        today = pd.Timestamp(now or pd.Timestamp.now()).normalize()
+        recent_start = (today - pd.Timedelta(days=TRENDING_DAYS - 1)).to_datetime64()
+        baseline_start = (today - pd.Timedelta(days=TRENDING_DAYS + BASELINE_DAYS - 1)).to_datetime64()
+        recent = placed_at >= recent_start
+        baseline = (placed_at >= baseline_start) & ~recent
+        self.recent = np.bincount(item[recent], minlength=n_items)
+        self.baseline = np.bincount(item[baseline], minlength=n_items)
+        rated = recent & (rating > 0)
+        self.recent_rated = np.bincount(item[rated], minlength=n_items)
+        self.recent_positive = np.bincount(item[rated & (rating >= POSITIVE_RATING)], minlength=n_items)
+
+    def _employee_counts(self, employee):
+        row = self.employee_rows.get(employee)
+        if row is None:
+            return np.zeros(len(ITEM_NAMES), dtype=np.int64)
+        return self.affinity[row]
+
+    def favorite(self, employee):
+        """Most ordered item, its category and that category's share of the employee's orders"""
+        counts = self._employee_counts(employee)
+        total = counts.sum()
+        if total == 0:
+            return None
+        best = int(np.argmax(counts))
+        category = ITEM_CATEGORIES[best]
+        share = counts[ITEM_CATEGORIES == category].sum() / total
+        return {'item': ITEM_NAMES[best], 'category': str(category), 'share': float(share)}
+
+    def for_hour(self, employee, hour):
+        """Best item for this hour of day, weighted by the employee's tastes, and what goes with it"""
+        popularity = self.hourly[hour].astype(np.float64)
+        if popularity.sum() == 0:
+            popularity = self.hourly.sum(axis=0).astype(np.float64)
+        if popularity.sum() == 0:
+            return None
+        share = popularity / popularity.sum()
+        counts = self._employee_counts(employee).astype(np.float64)
+        # Items the employee orders, or that people with similar orders also order, rank higher
+        taste = counts + self.co_occurrence @ (counts > 0).astype(np.float64)
+        scores = share * (1 + taste / taste.max()) if taste.max() > 0 else share
+        best = int(np.argmax(scores))
+        # Pair it with the most co-ordered item from another category
+        pairing = self.co_occurrence[best] * (ITEM_CATEGORIES != ITEM_CATEGORIES[best])
+        return {
+            'item': ITEM_NAMES[best],
+            'pairing': ITEM_NAMES[int(np.argmax(pairing))] if pairing.max() > 0 else None,
+            'share': float(share[best]),
+        }
+
+    def trending(self):
+        """Item whose share of orders grew most over the last week, with its positive rating share"""
+        if self.recent.sum() == 0:
+            return None
+        recent_share = self.recent / self.recent.sum()
+        baseline_share = self.baseline / self.baseline.sum() if self.baseline.sum() > 0 else recent_share
+        best = int(np.argmax(recent_share - baseline_share))
+        rated = self.recent_rated[best]
+        return {
+            'item': ITEM_NAMES[best],
+            'growth': float(recent_share[best] - baseline_share[best]),
+            'positive': float(self.recent_positive[best] / rated) if rated > 0 else None,
+        }
+
+    def recommend(self, employee, hour):
+        """Everything the recommendation cards show for one employee"""
+        return {
+            'favorite': self.favorite(employee),
+            'for_hour': self.for_hour(employee, hour),
+            'trending': self.trending(),
+        }
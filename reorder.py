@@ -0,0 +1,55 @@
+"""
+Stockout projection and reorder quantities for the inventory.
+
+Daily usage of every ingredient comes from the recipes of the orders
+delivered over the last USAGE_WINDOW_DAYS. From it each inventory row gets
+the days until it runs out, a reorder point covering the supplier lead time
+plus safety stock, and the quantity that brings it back up to cover one
+review period on top of that. Everything is computed column-wise for all
+SKUs at once.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from recipes import consumption
+from schema import epoch_seconds
+
+USAGE_WINDOW_DAYS = 14
+# Days between placing a purchase order and the stock arriving
+LEAD_TIME_DAYS = 2
+SAFETY_STOCK_DAYS = 1
+# Each order should cover this many days of usage beyond the reorder point
+REVIEW_PERIOD_DAYS = 7
+
+
+def daily_usage(orders_df, ingredients, now=None, days=USAGE_WINDOW_DAYS):
+    """Average quantity of each ingredient used per day over the last `days` of deliveries"""
+    now = pd.Timestamp(now or datetime.now())
+    delivered = orders_df['Delivered At'].to_numpy(dtype=np.float64) >= epoch_seconds(now - pd.Timedelta(days=days))
+    return consumption(orders_df['Item'][delivered], ingredients) / days
+
+
+def reorder_plan(inventory, usage, now=None):
+    """Days to stockout, reorder point and reorder quantity for every inventory row"""
+    now = pd.Timestamp(now or datetime.now())
+    stock = inventory['Stock Level'].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        days_left = np.where(usage > 0, stock / usage, np.inf)
+    reorder_point = np.maximum(usage * (LEAD_TIME_DAYS + SAFETY_STOCK_DAYS), inventory['Threshold'].to_numpy())
+    order_up_to = reorder_point + usage * REVIEW_PERIOD_DAYS
+    stockout_at = pd.to_datetime(
+        np.where(np.isfinite(days_left), now.value + days_left * 86_400e9, np.nan), unit='ns'
+    )
+    return pd.DataFrame({
+        'Item': inventory['Item'].to_numpy(),
+        'Unit': inventory['Unit'].to_numpy(),
+        'Stock Level': stock,
+        'Daily Usage': usage,
+        'Days To Stockout': days_left,
+        'Stockout Date': stockout_at,
+        'Reorder Point': reorder_point,
+        'Reorder Now': stock <= reorder_point,
+        'Reorder Quantity': np.where(stock <= reorder_point, np.ceil(order_up_to - stock), 0),
+    })
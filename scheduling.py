@@ -0,0 +1,132 @@
+"""
+Workload-balancing assignment of new orders to kitchen staff.
+
+A new order is assigned to the eligible cook with the least outstanding
+prep work. Priority does not change the choice: the kitchen's head-start
+rule (kitchen_queue.HEAD_START_MINUTES) lets a high-priority order jump only
+the few minutes of lower-priority work placed just before it, so nearly all
+of a cook's outstanding work is ahead of any new order. StaffScheduler keeps
+one min-heap of eligible staff keyed by that work and assigns each order to
+its top in O(log n). Heap entries
+are never updated in place: a load change pushes a fresh entry and stale
+ones are skipped when they reach the top.
+"""
+import heapq
+import itertools
+import re
+from datetime import datetime
+
+import pandas as pd
+
+from schema import PRIORITY_DTYPE
+
+PRIORITIES = tuple(PRIORITY_DTYPE.categories)
+OUTSTANDING_STATUSES = ('queued', 'preparing')
+# Roles that cook orders and so receive them from the scheduler
+COOKING_ROLES = ('Head Chef', 'Senior Cook', 'Cook')
+
+# Stale heap entries are dropped wholesale once they outnumber live ones this much
+COMPACT_FACTOR = 4
+
+SHIFT_HOURS = re.compile(r"(\d{1,2})\s*(AM|PM)\s*-\s*(\d{1,2})\s*(AM|PM)", re.IGNORECASE)
+
+
+def _hour_24(hour, meridiem):
+    return int(hour) % 12 + (12 if meridiem.upper() == 'PM' else 0)
+
+
+def on_shift(shift, hour):
+    """Whether a shift label such as 'Morning (7AM-3PM)' covers an hour of the day"""
+    match = SHIFT_HOURS.search(shift or "")
+    if match is None:
+        return True
+    start, end = _hour_24(*match.group(1, 2)), _hour_24(*match.group(3, 4))
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def eligible_staff(kitchen_staff, now=None):
+    """Names of active cooks who are on shift and not on leave at `now`
+
+    Only COOKING_ROLES take orders; kitchen assistants do not. Outside every
+    shift, any cook who is active and not on leave is eligible, and if nobody
+    is, every cook is, so orders always get an owner.
+    """
+    now = pd.Timestamp(now or datetime.now())
+    cooks = kitchen_staff['Role'].isin(COOKING_ROLES)
+    if cooks.any():
+        kitchen_staff = kitchen_staff[cooks]
+    today = now.normalize()
+    leave_start = pd.to_datetime(kitchen_staff['Leave Start'], errors='coerce')
+    leave_end = pd.to_datetime(kitchen_staff['Leave End'], errors='coerce')
+    on_leave = (leave_start <= today) & (today <= leave_end)
+    available = (kitchen_staff['Status'] == 'Active') & ~on_leave
+    shift = kitchen_staff['Shift'].astype(object).map(lambda label: on_shift(label, now.hour))
+    working = kitchen_staff['Name'][available & shift.astype(bool)].tolist()
+    return working or kitchen_staff['Name'][available].tolist() or kitchen_staff['Name'].tolist()
+
+
+class StaffScheduler:
+    """Least-loaded staff assignment with lazy heap deletion"""
+
+    def __init__(self, staff=()):
+        # Outstanding prep minutes per staff member
+        self._load = {}
+        self._heap = []
+        self._eligible = set()
+        self._sequence = itertools.count()
+        self.set_eligible(staff)
+
+    def _push(self, name):
+        heapq.heappush(self._heap, (self._load.get(name, 0), next(self._sequence), name))
+        if len(self._heap) > COMPACT_FACTOR * (len(self._eligible) + 1):
+            self.set_eligible(self._eligible)
+
+    def set_eligible(self, staff):
+        """Replace the set of staff who may receive new orders"""
+        self._eligible = set(staff)
+        self._heap = []
+        for name in self._eligible:
+            self._push(name)
+
+    def add(self, name, work=1):
+        """Record `work` outstanding at `name`"""
+        self.add_many([(name, work)])
+
+    def release(self, name, work=1):
+        """Remove outstanding work once an order is delivered or moved away"""
+        self.add(name, -work)
+
+    def add_many(self, bookings):
+        """add() a batch of (name, work) bookings, re-pushing each staff member once"""
+        touched = set()
+        for name, work in bookings:
+            self._load[name] = self._load.get(name, 0) + work
+            touched.add(name)
+        for name in touched & self._eligible:
+            self._push(name)
+
+    def release_many(self, bookings):
+        """release() a batch of (name, work) bookings"""
+        self.add_many((name, -work) for name, work in bookings)
+
+    def choose(self):
+        """Eligible staff member with the least outstanding work, or None"""
+        while self._heap:
+            load, _, name = self._heap[0]
+            if name in self._eligible and load == self._load.get(name, 0):
+                return name
+            heapq.heappop(self._heap)
+        return None
+
+    def assign(self, work=1):
+        """choose() a staff member and book the order's work to them"""
+        name = self.choose()
+        if name is not None:
+            self.add(name, work)
+        return name
+
+    def load(self, name):
+        """Total outstanding work of a staff member"""
+        return self._load.get(name, 0)
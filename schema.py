@@ -0,0 +1,135 @@
+"""
+Column types for every table held by the order store.
+
+Low-cardinality text columns are pandas categoricals: filters such as
+`Status.isin(...)` compare small integer codes instead of Python strings, and
+each distinct value is stored once. Columns with a closed set of values use a
+fixed category list; names (items, employees, staff) learn new categories as
+rows arrive. Free text uses pandas' default string dtype ("str"), which is
+stored far more compactly than Python objects when pyarrow is available.
+
+Run `python schema.py [rows]` for a memory report of the order table.
+"""
+import sys
+
+import pandas as pd
+
+STATUS_DTYPE = pd.CategoricalDtype(['queued', 'preparing', 'delivered'])
+PRIORITY_DTYPE = pd.CategoricalDtype(['high', 'normal', 'low'], ordered=True)
+DELIVERY_METHOD_DTYPE = pd.CategoricalDtype(['Staff', 'Robot'])
+STOCK_STATUS_DTYPE = pd.CategoricalDtype(['critical', 'low', 'stable'])
+STAFF_STATUS_DTYPE = pd.CategoricalDtype(['Active', 'On Leave'])
+
+ORDER_COLUMNS = {
+    "Order ID": "int32",
+    "Item": "category",
+    "Employee": "category",
+    "Status": STATUS_DTYPE,
+    "Priority": PRIORITY_DTYPE,
+    "ETA (min)": "int16",
+    "Timestamp": "str",
+    "Cost": "float32",
+    "Assigned Staff": "category",
+    "Message": "str",
+    "Rating": "int8",
+    "Delivery Method": DELIVERY_METHOD_DTYPE,
+    "Placed At": "datetime64[ns]",
+    # Lifecycle transitions as epoch seconds; NaN until the transition happens
+    "Started At": "float64",
+    "Delivered At": "float64",
+}
+
+EMPLOYEE_COLUMNS = {
+    "Employee ID": "str",
+    "Name": "str",
+    "Department": "category",
+    "Position": "category",
+    "Priority Level": PRIORITY_DTYPE,
+    "Email": "str",
+    "Phone": "str",
+    "Join Date": "str",
+}
+
+KITCHEN_STAFF_COLUMNS = {
+    "Staff ID": "str",
+    "Name": "str",
+    "Role": "category",
+    "Shift": "category",
+    "Status": STAFF_STATUS_DTYPE,
+    "Leave Start": "str",
+    "Leave End": "str",
+    "Coverage By": "str",
+    "Email": "str",
+    "Phone": "str",
+    "Join Date": "str",
+    "Performance Rating": "float32",
+}
+
+INVENTORY_COLUMNS = {
+    "Item": "str",
+    # Fractional: recipes consume ingredients in fractions of a unit
+    "Stock Level": "float64",
+    "Unit": "category",
+    "Threshold": "int32",
+    "Status": STOCK_STATUS_DTYPE,
+    # Date stock was last received
+    "Last Order": "datetime64[ns]",
+}
+
+FEEDBACK_COLUMNS = {
+    "Employee": "category",
+    "Staff Member": "category",
+    "Rating": "int8",
+    "Comment": "str",
+    "Date": "str",
+}
+
+TABLE_COLUMNS = {
+    "orders": ORDER_COLUMNS,
+    "employees": EMPLOYEE_COLUMNS,
+    "kitchen_staff": KITCHEN_STAFF_COLUMNS,
+    "inventory": INVENTORY_COLUMNS,
+    "feedback": FEEDBACK_COLUMNS,
+}
+
+
+def epoch_seconds(timestamp):
+    """Seconds since the epoch on the same wall clock as 'Placed At' (naive local time)"""
+    return pd.Timestamp(timestamp).value / 1e9
+
+
+def apply_schema(frame, columns):
+    """Cast a table to its declared column types, in declaration order"""
+    return frame[list(columns)].astype(columns)
+
+
+def memory_report(rows=100_000):
+    """Bytes per order column under pandas' default dtypes versus the declared schema"""
+    import seed
+
+    # About 64 business days fall in the 90-day window
+    history = seed.seed_order_history(days=90, orders_per_day=max(rows // 64, 1))
+    # Text as pandas infers it when reading, numbers at 64 bits
+    plain = history.astype({
+        name: "str" for name, dtype in ORDER_COLUMNS.items()
+        if dtype in ("category", "str") or isinstance(dtype, pd.CategoricalDtype)
+    }).astype({"Order ID": "int64", "ETA (min)": "int64", "Cost": "float64", "Rating": "int64"})
+    typed = apply_schema(plain, ORDER_COLUMNS)
+
+    report = pd.DataFrame({
+        "Default Bytes": plain.memory_usage(deep=True, index=False),
+        "Schema Bytes": typed.memory_usage(deep=True, index=False),
+    })
+    report.loc["Total"] = report.sum()
+    report["Reduction"] = 1 - report["Schema Bytes"] / report["Default Bytes"]
+    return len(plain), report
+
+
+if __name__ == "__main__":
+    row_count, report = memory_report(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    print(f"Order table memory, {row_count:,} rows")
+    print(report.to_string(formatters={
+        "Default Bytes": "{:,.0f}".format,
+        "Schema Bytes": "{:,.0f}".format,
+        "Reduction": "{:.1%}".format,
+    }))
@@ -0,0 +1,152 @@
+"""
+Seed tables used to populate the shared order store on first start.
+"""
+import numpy as np
+import pandas as pd
+
+from menu import ITEMS_BY_NAME
+
+HISTORY_STAFF = ["Maria Santos", "John Martinez", "Chen Wei", "Alex Rodriguez"]
+
+# Typical minutes an order waits in the queue before a cook starts it
+MEAN_QUEUE_WAIT_MINUTES = 4
+
+# Relative order volume for each opening hour, 09:00 through 17:00
+OPENING_HOURS = np.arange(9, 18)
+HOURLY_WEIGHTS = np.array([8, 15, 22, 35, 42, 38, 18, 12, 9], dtype=float)
+
+
+def seed_orders():
+    """Today's sample orders"""
+    orders = pd.DataFrame({
+        "Order ID": range(101, 111),
+        "Item": ["Espresso", "Club Sandwich", "Green Tea", "Cappuccino", "Caesar Salad",
+                 "Latte", "Burger Deluxe", "Matcha Latte", "Espresso", "Pasta Primavera"],
+        "Employee": ["Sarah Chen", "Mike Ross", "Emma Stone", "John Doe", "Lisa Wang",
+                     "Alex Kumar", "Tom Brady", "Sophie Turner", "James Wilson", "Maria Garcia"],
+        "Status": ["delivered", "preparing", "queued", "queued", "preparing",
+                   "queued", "queued", "delivered", "preparing", "queued"],
+        "Priority": ["normal", "high", "normal", "normal", "normal",
+                     "low", "high", "normal", "normal", "normal"],
+        "ETA (min)": [0, 5, 12, 10, 7, 15, 20, 0, 6, 10],
+        "Timestamp": ["09:15 AM", "09:30 AM", "09:45 AM", "10:00 AM", "10:15 AM",
+                      "10:30 AM", "10:45 AM", "11:00 AM", "11:15 AM", "11:30 AM"],
+        "Cost": [4.50, 8.99, 3.50, 5.00, 9.50, 4.75, 12.99, 5.50, 4.50, 11.99],
+        "Assigned Staff": ["Maria Santos", "John Martinez", "Chen Wei", "Maria Santos", "John Martinez",
+                           "Chen Wei", "Maria Santos", "John Martinez", "Chen Wei", "Maria Santos"],
+        "Message": ["", "", "", "", "", "", "", "", "", ""],
+        "Rating": [5, 0, 0, 0, 0, 0, 0, 4, 0, 0],
+        "Delivery Method": ["Staff", "Staff", "Staff", "Staff", "Staff", "Staff", "Staff", "Staff", "Staff", "Staff"]
+    })
+    today = pd.Timestamp.now().strftime("%Y-%m-%d")
+    orders["Placed At"] = pd.to_datetime(today + " " + orders["Timestamp"], format="%Y-%m-%d %I:%M %p")
+    started, delivered = _lifecycle(orders["Placed At"].to_numpy(), orders["Item"].to_numpy(),
+                                    np.random.default_rng(0))
+    orders["Started At"] = np.where(orders["Status"] != "queued", started, np.nan)
+    orders["Delivered At"] = np.where(orders["Status"] == "delivered", delivered, np.nan)
+    return orders
+
+def _lifecycle(placed_at, items, rng):
+    """Epoch seconds at which each order was started and delivered, around typical wait and prep times"""
+    placed = placed_at.astype("datetime64[ns]").astype(np.int64) / 1e9
+    wait = rng.exponential(MEAN_QUEUE_WAIT_MINUTES, size=len(items))
+    prep = np.array([ITEMS_BY_NAME[name].prep_minutes for name in items]) * rng.lognormal(0, 0.3, size=len(items))
+    started = placed + wait * 60
+    return started, started + prep * 60
+
+def seed_order_history(days=90, orders_per_day=60, random_seed=42):
+    """Delivered orders for the business days before today, oldest first"""
+    rng = np.random.default_rng(random_seed)
+    today = pd.Timestamp.now().normalize()
+    dates = pd.bdate_range(today - pd.Timedelta(days=days), today - pd.Timedelta(days=1))
+    counts = rng.poisson(orders_per_day, len(dates))
+    total = int(counts.sum())
+
+    hours = rng.choice(OPENING_HOURS, size=total, p=HOURLY_WEIGHTS / HOURLY_WEIGHTS.sum())
+    seconds = rng.integers(0, 3600, size=total)
+    placed_at = np.sort(
+        dates.values.repeat(counts)
+        + (hours * 3600 + seconds).astype("timedelta64[s]")
+    )
+
+    employees = seed_employees()
+    names = np.array(employees["Name"].tolist() + ["James Wilson", "Maria Garcia"])
+    priority = dict(zip(employees["Name"], employees["Priority Level"]))
+    items = np.array(list(ITEMS_BY_NAME))
+    employee = rng.choice(names, size=total)
+    item = rng.choice(items, size=total)
+    started, delivered = _lifecycle(placed_at, item, rng)
+
+    return pd.DataFrame({
+        "Order ID": np.arange(1, total + 1),
+        "Item": item,
+        "Employee": employee,
+        "Status": "delivered",
+        "Priority": [priority.get(name, "normal") for name in employee],
+        "ETA (min)": 0,
+        "Timestamp": pd.DatetimeIndex(placed_at).strftime("%I:%M %p"),
+        "Cost": [ITEMS_BY_NAME[name].price for name in item],
+        "Assigned Staff": rng.choice(HISTORY_STAFF, size=total),
+        "Message": "",
+        "Rating": rng.choice([0, 3, 4, 5], size=total, p=[0.5, 0.1, 0.2, 0.2]),
+        "Delivery Method": rng.choice(["Staff", "Robot"], size=total, p=[0.7, 0.3]),
+        "Placed At": placed_at,
+        "Started At": started,
+        "Delivered At": delivered,
+    })
+
+def seed_employees():
+    """Company employee directory"""
+    return pd.DataFrame({
+        "Employee ID": ["E001", "E002", "E003", "E004", "E005", "E006", "E007", "E008"],
+        "Name": ["Sarah Chen", "Mike Ross", "Emma Stone", "John Doe", "Lisa Wang", "Alex Kumar", "Tom Brady", "Sophie Turner"],
+        "Department": ["Engineering", "Sales", "Marketing", "Finance", "HR", "Operations", "IT", "Customer Success"],
+        "Position": ["Senior Engineer", "Sales Manager", "Marketing Lead", "Financial Analyst", "HR Manager", "Operations Coordinator", "IT Specialist", "CS Manager"],
+        "Priority Level": ["normal", "high", "high", "normal", "high", "normal", "normal", "high"],  # Based on position
+        "Email": ["sarah.chen@company.com", "mike.ross@company.com", "emma.stone@company.com", "john.doe@company.com", 
+                  "lisa.wang@company.com", "alex.kumar@company.com", "tom.brady@company.com", "sophie.turner@company.com"],
+        "Phone": ["+971-50-123-4567", "+971-50-234-5678", "+971-50-345-6789", "+971-50-456-7890",
+                  "+971-50-567-8901", "+971-50-678-9012", "+971-50-789-0123", "+971-50-890-1234"],
+        "Join Date": ["2023-01-15", "2022-06-10", "2023-03-20", "2021-11-05", "2022-09-12", "2023-07-01", "2022-02-28", "2023-05-18"]
+    })
+
+def seed_kitchen_staff():
+    """Kitchen staff roster with leave and coverage details"""
+    return pd.DataFrame({
+        "Staff ID": ["KS001", "KS002", "KS003", "KS004", "KS005", "KS006"],
+        "Name": ["Maria Santos", "John Martinez", "Chen Wei", "Alex Rodriguez", "Fatima Ahmed", "David Kumar"],
+        "Role": ["Head Chef", "Senior Cook", "Cook", "Cook", "Kitchen Assistant", "Kitchen Assistant"],
+        "Shift": ["Morning (7AM-3PM)", "Morning (7AM-3PM)", "Afternoon (12PM-8PM)", "Afternoon (12PM-8PM)", "Morning (7AM-3PM)", "Afternoon (12PM-8PM)"],
+        "Status": ["Active", "Active", "On Leave", "Active", "Active", "On Leave"],
+        "Leave Start": [None, None, "2026-02-01", None, None, "2026-01-29"],
+        "Leave End": [None, None, "2026-02-07", None, None, "2026-02-02"],
+        "Coverage By": [None, None, "Alex Rodriguez", None, None, "Fatima Ahmed"],
+        "Email": ["maria.santos@kitchen.com", "john.martinez@kitchen.com", "chen.wei@kitchen.com", 
+                  "alex.rodriguez@kitchen.com", "fatima.ahmed@kitchen.com", "david.kumar@kitchen.com"],
+        "Phone": ["+971-52-111-2222", "+971-52-222-3333", "+971-52-333-4444", 
+                  "+971-52-444-5555", "+971-52-555-6666", "+971-52-666-7777"],
+        "Join Date": ["2021-03-15", "2022-01-10", "2022-08-20", "2023-02-05", "2023-06-12", "2023-09-01"],
+        "Performance Rating": [4.9, 4.7, 4.5, 4.6, 4.3, 4.4]
+    })
+
+def seed_inventory():
+    """Kitchen inventory stock levels"""
+    return pd.DataFrame({
+        "Item": ["Coffee Beans", "Milk", "Bread", "Tea Leaves", "Vegetables"],
+        "Stock Level": [20, 5, 12, 3, 15],
+        "Unit": ["kg", "L", "loaves", "kg", "kg"],
+        "Threshold": [10, 8, 6, 5, 10],
+        "Status": ["stable", "low", "stable", "critical", "stable"],
+        "Last Order": pd.Timestamp.now().normalize() - pd.to_timedelta([2, 1, 0, 3, 0], unit="D")
+    })
+
+def seed_feedback():
+    """Service feedback left by employees"""
+    return pd.DataFrame({
+        "Employee": ["Aman Gupta", "Riya Patel", "Sara Williams", "David Lee"],
+        "Staff Member": ["John Martinez", "Maria Santos", "John Martinez", "Chen Wei"],
+        "Rating": [5, 4, 5, 5],
+        "Comment": ["Exceptional service, very prompt delivery", "Quick response time, professional", 
+                    "Very polite and helpful staff", "Perfect order accuracy every time"],
+        "Date": ["Jan 24", "Jan 24", "Jan 23", "Jan 23"]
+    })
@@ -0,0 +1,237 @@
+"""
+Order statistics for the kitchen and admin dashboards.
+
+OrderCounters holds the dashboard counters (status counts, revenue and
+average ETA) as running totals, and Rollups keeps them per hour, day, week
+and staff member so the store can update them on every order event and
+answer period queries without scanning orders.
+"""
+import numpy as np
+import pandas as pd
+
+STATUSES = ('queued', 'preparing', 'delivered')
+# Smallest batch Rollups.add_frame() folds in with groupbys rather than row by row
+FRAME_ROWS = 32
+
+
+class OrderCounters:
+    """Order count per status, revenue and average ETA as running totals"""
+
+    __slots__ = ('total', 'by_status', 'revenue', 'eta_sum', 'eta_count')
+
+    def __init__(self):
+        self.total = 0
+        self.by_status = dict.fromkeys(STATUSES, 0)
+        self.revenue = 0.0
+        self.eta_sum = 0
+        self.eta_count = 0
+
+    def add(self, status, cost, eta, sign=1):
+        self.total += sign
+        self.by_status[status] = self.by_status.get(status, 0) + sign
+        self.revenue += sign * float(cost)
+        if eta > 0:
+            self.eta_sum += sign * int(eta)
+            self.eta_count += sign
+
+    def remove(self, status, cost, eta):
+        self.add(status, cost, eta, sign=-1)
+
+    def merge(self, other, sign=1):
+        """Add (or with sign=-1, subtract) another set of counters"""
+        self.total += sign * other.total
+        for status, count in other.by_status.items():
+            self.by_status[status] = self.by_status.get(status, 0) + sign * count
+        self.revenue += sign * other.revenue
+        self.eta_sum += sign * other.eta_sum
+        self.eta_count += sign * other.eta_count
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    def as_stats(self):
+        stats = {'total': self.total}
+        for status in STATUSES:
+            stats[status] = self.by_status.get(status, 0)
+        stats['revenue'] = self.revenue
+        stats['avg_eta'] = self.eta_sum / self.eta_count if self.eta_count > 0 else 0
+        return stats
+
+
+def _grouped_counters(orders_df, keys, sign=1):
+    """OrderCounters per group of `keys` (one key array or a list of them)
+
+    Groups are numbered with pd.factorize and summed with np.bincount: a
+    DataFrame groupby costs milliseconds even for a few dozen rows, and an
+    ETA refresh pays for two batches on every order. Rows with a missing key
+    are left out, as groupby does. `sign` weights every row (+1 or -1, or
+    an array of one per row).
+    """
+    keys = keys if isinstance(keys, list) else [keys]
+    codes = np.zeros(len(keys[0]), dtype=np.int64)
+    factorized = []
+    for key in keys:
+        key_codes, key_uniques = pd.factorize(key)
+        codes = np.where((codes < 0) | (key_codes < 0), -1, codes * len(key_uniques) + key_codes)
+        factorized.append((key_codes, key_uniques))
+    present = codes >= 0
+    groups, first, inverse = np.unique(codes[present], return_index=True, return_inverse=True)
+    rows = np.flatnonzero(present)[first]
+
+    eta = np.asarray(orders_df['ETA (min)']).astype(np.int64)[present]
+    status = np.asarray(orders_df['Status'], dtype=object)[present]
+    measures = {
+        'total': np.ones(len(eta)),
+        'revenue': np.asarray(orders_df['Cost'], dtype=np.float64)[present],
+        'eta_sum': np.where(eta > 0, eta, 0),
+        'eta_count': eta > 0,
+        **{name: status == name for name in STATUSES},
+    }
+    sign = np.broadcast_to(sign, len(present))[present]
+    sums = {name: np.bincount(inverse, weights=sign * values, minlength=len(groups))
+            for name, values in measures.items()}
+
+    counters = {}
+    # pd.Index turns datetime64 keys into Timestamps
+    key_values = [pd.Index(key_uniques)[key_codes[rows]] for key_codes, key_uniques in factorized]
+    for index, key in enumerate(zip(*key_values)):
+        group = OrderCounters()
+        group.total = int(sums['total'][index])
+        group.by_status = {name: int(sums[name][index]) for name in STATUSES}
+        group.revenue = float(sums['revenue'][index])
+        group.eta_sum = int(sums['eta_sum'][index])
+        group.eta_count = int(sums['eta_count'][index])
+        counters[key if len(keys) > 1 else key[0]] = group
+    return counters
+
+
+def _week_start(day):
+    return day - pd.Timedelta(days=day.weekday())
+
+
+class Rollups:
+    """Materialized OrderCounters per hour, day and week, and per staff member per day.
+
+    Built once from the order log, then kept current by add()/remove() on every
+    order event, so period dashboards sum a handful of buckets instead of
+    scanning orders. Bucket keys are the bucket's start as a pd.Timestamp.
+    """
+
+    def __init__(self):
+        self.hours = {}
+        self.days = {}
+        self.weeks = {}
+        self.staff_days = {}
+
+    @classmethod
+    def from_frame(cls, orders_df, sign=1):
+        """Rollups of a DataFrame or column -> array mapping of orders"""
+        rollups = cls()
+        placed_at = np.asarray(orders_df['Placed At'], dtype='datetime64[ns]')
+        hour = placed_at.astype('datetime64[h]')
+        day = placed_at.astype('datetime64[D]')
+        # Day 0 of the epoch was a Thursday, weekday 3
+        week = day - (day.astype(np.int64) + 3) % 7
+        staff = np.asarray(orders_df['Assigned Staff'], dtype=object)
+        rollups.hours = _grouped_counters(orders_df, hour, sign)
+        rollups.days = _grouped_counters(orders_df, day, sign)
+        rollups.weeks = _grouped_counters(orders_df, week, sign)
+        rollups.staff_days = _grouped_counters(orders_df, [day, staff], sign)
+        return rollups
+
+    def add(self, placed_at, staff, status, cost, eta, sign=1):
+        # Truncating the datetime64 is an order of magnitude cheaper than Timestamp.floor
+        hour = pd.Timestamp(pd.Timestamp(placed_at).to_datetime64().astype('datetime64[h]'))
+        day = hour.normalize()
+        for table, key in ((self.hours, hour), (self.days, day), (self.weeks, _week_start(day)),
+                           (self.staff_days, (day, staff))):
+            table.setdefault(key, OrderCounters()).add(status, cost, eta, sign)
+
+    def remove(self, placed_at, staff, status, cost, eta):
+        self.add(placed_at, staff, status, cost, eta, sign=-1)
+
+    def add_frame(self, orders_df, sign=1):
+        """Fold a batch of orders (a DataFrame or column -> array mapping) into every rollup
+
+        `sign` is +1 or -1 for the whole batch, or an array of one per row.
+        Batches below FRAME_ROWS go through add() row by row, which is cheaper
+        than the grouped sums used for larger ones.
+        """
+        columns = ('Placed At', 'Assigned Staff', 'Status', 'Cost', 'ETA (min)')
+        rows = len(orders_df[columns[0]])
+        if rows < FRAME_ROWS:
+            for row_sign, *fields in zip(np.broadcast_to(sign, rows), *(orders_df[column] for column in columns)):
+                self.add(*fields, sign=int(row_sign))
+            return
+        batch = Rollups.from_frame(orders_df, sign)
+        for table, counters in ((self.hours, batch.hours), (self.days, batch.days),
+                                (self.weeks, batch.weeks), (self.staff_days, batch.staff_days)):
+            for key, bucket in counters.items():
+                table.setdefault(key, OrderCounters()).merge(bucket)
+
+    def remove_frame(self, orders_df):
+        self.add_frame(orders_df, sign=-1)
+
+    def replace_frame(self, old, new):
+        """Swap the old values of a batch of orders for their new ones in a single pass"""
+        columns = ('Placed At', 'Assigned Staff', 'Status', 'Cost', 'ETA (min)')
+        rows = len(old[columns[0]])
+        both = {column: np.concatenate([np.asarray(old[column]), np.asarray(new[column])]) for column in columns}
+        self.add_frame(both, sign=np.repeat([-1, 1], rows))
+
+    def totals_since(self, start):
+        """Counters for everything placed from midnight of `start` on.
+
+        Whole weeks come from the week rollup; only the days before the first
+        whole week are read from the day rollup.
+        """
+        start = pd.Timestamp(start).normalize()
+        first_week = start + pd.Timedelta(days=(7 - start.weekday()) % 7)
+        totals = OrderCounters()
+        for week, counters in self.weeks.items():
+            if week >= first_week:
+                totals += counters
+        day = start
+        while day < first_week:
+            if day in self.days:
+                totals += self.days[day]
+            day += pd.Timedelta(days=1)
+        return totals
+
+    def hourly_since(self, start, hours):
+        """Orders and revenue per hour of day from `start` on, for at least `hours`"""
+        start = pd.Timestamp(start)
+        orders = np.zeros(24, dtype=np.int64)
+        revenue = np.zeros(24)
+        for hour, counters in self.hours.items():
+            if hour >= start:
+                orders[hour.hour] += counters.total
+                revenue[hour.hour] += counters.revenue
+        hours = np.union1d(hours, np.flatnonzero(orders))
+        return pd.DataFrame({
+            'Hour': [f"{hour:02d}:00" for hour in hours],
+            'Orders': orders[hours],
+            'Revenue': revenue[hours].round(2),
+        })
+
+    def daily_between(self, start, end):
+        """Orders and revenue per calendar day from `start` to `end`, inclusive"""
+        days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq='D')
+        empty = OrderCounters()
+        per_day = [self.days.get(day, empty) for day in days]
+        return pd.DataFrame({
+            'Day': days,
+            'Orders': [counters.total for counters in per_day],
+            'Revenue': [round(counters.revenue, 2) for counters in per_day],
+        })
+
+    def staff_since(self, start):
+        """OrderCounters per assigned staff member from midnight of `start` on"""
+        start = pd.Timestamp(start).normalize()
+        per_staff = {}
+        for (day, staff), counters in self.staff_days.items():
+            if day >= start:
+                per_staff.setdefault(staff, OrderCounters())
+                per_staff[staff] += counters
+        return per_staff
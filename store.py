@@ -0,0 +1,511 @@
+"""
+Process-wide order store shared by every Streamlit session.
+
+Streamlit runs each browser session in its own script thread, so the tables
+live here once per process instead of being copied into st.session_state.
+Orders and feedback are append-only ColumnarLogs; the other tables are small
+and are replaced copy-on-write. Writers take the lock of the table they touch
+and, when the store is backed by a Database, write through to SQLite.
+"""
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import seed
+from columnar import ColumnarLog, SortedIndex
+from eta import EtaEstimator
+from forecast import DemandForecast
+from kitchen_queue import KitchenQueue
+from persistence import Database
+from scheduling import OUTSTANDING_STATUSES, StaffScheduler, eligible_staff
+from recipes import consumption
+from schema import STOCK_STATUS_DTYPE, TABLE_COLUMNS, apply_schema, epoch_seconds
+from stats import Rollups
+
+DEFAULT_DATABASE_PATH = os.environ.get(
+    "WORKPLACE_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "workplace.db")
+)
+
+# Reporting periods are trailing windows that start at midnight `days - 1` days ago
+PERIOD_DAYS = {"Today": 1, "This Week": 7, "This Month": 30, "This Quarter": 90}
+
+# Order columns the hour/day/week/staff rollups are keyed and summed on
+ROLLUP_COLUMNS = ('Placed At', 'Assigned Staff', 'Status', 'Cost', 'ETA (min)')
+
+
+def period_start(time_filter, now=None):
+    """First timestamp included in a reporting period"""
+    today = pd.Timestamp(now or datetime.now()).normalize()
+    return today - pd.Timedelta(days=PERIOD_DAYS[time_filter] - 1)
+
+
+def stock_statuses(stock_levels, thresholds):
+    """Classify every stock level against its reorder threshold in one pass"""
+    stock_levels, thresholds = np.asarray(stock_levels), np.asarray(thresholds)
+    statuses = np.select([stock_levels < thresholds / 2, stock_levels < thresholds], ['critical', 'low'], 'stable')
+    return pd.Categorical(statuses, dtype=STOCK_STATUS_DTYPE)
+
+
+class OrderStore:
+    """Thread-safe container for orders, staff, inventory and feedback"""
+
+    def __init__(self, orders, employees, kitchen_staff, inventory, feedback, database=None):
+        orders = apply_schema(orders, TABLE_COLUMNS["orders"])
+        self._orders = ColumnarLog.from_frame(orders, TABLE_COLUMNS["orders"])
+        self._employees = apply_schema(employees, TABLE_COLUMNS["employees"])
+        self._kitchen_staff = apply_schema(kitchen_staff, TABLE_COLUMNS["kitchen_staff"])
+        self._inventory = apply_schema(inventory, TABLE_COLUMNS["inventory"])
+        self._feedback = ColumnarLog.from_frame(
+            apply_schema(feedback, TABLE_COLUMNS["feedback"]), TABLE_COLUMNS["feedback"]
+        )
+        self._order_rows = {int(order_id): row for row, order_id in enumerate(orders['Order ID'])}
+        # Hash indexes for per-user lookups: employee name -> row, name -> order rows
+        self._employee_rows = {name: row for row, name in enumerate(self._employees['Name'])}
+        self._employee_order_rows = {
+            name: rows.tolist()
+            for name, rows in orders.groupby('Employee', observed=True, sort=False).indices.items()
+        }
+        # Order rows by 'Placed At', so range queries binary-search whatever order rows arrive in
+        self._orders_by_time = SortedIndex(orders['Placed At'].to_numpy())
+        # Hour/day/week/staff rollups, updated on every order event
+        self._rollups = Rollups.from_frame(orders)
+        # Weekday/hour demand model over completed hours, caught up on read
+        self._forecast = DemandForecast.from_orders(orders, datetime.now())
+        # Outstanding work per staff member; new orders go to the least loaded
+        self._scheduler = StaffScheduler(eligible_staff(self._kitchen_staff))
+        self._schedule_hour = pd.Timestamp.now().floor('h')
+        # Queued and preparing orders in the order the kitchen should work them
+        self._kitchen_queue = KitchenQueue()
+        self._eta = EtaEstimator.from_orders(orders)
+        # Order ID -> (staff, priority, prep minutes) booked with the scheduler
+        self._booked = {}
+        self._staff_orders = {}
+        self._track(np.flatnonzero(orders['Status'].isin(OUTSTANDING_STATUSES).to_numpy()))
+        self._next_order_id = int(orders['Order ID'].max()) + 1 if len(orders) else 1
+        self._database = database
+        for staff in list(self._staff_orders):
+            self._refresh_etas(staff)
+
+        # One lock per table so a stock update never waits on an order write
+        self._orders_lock = threading.RLock()
+        self._inventory_lock = threading.Lock()
+        self._feedback_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+
+        # Bumped on every write; sessions compare them to detect changes
+        self.version = 0
+        self.versions = {"orders": 0, "inventory": 0, "feedback": 0}
+
+    @staticmethod
+    def _seed_tables():
+        # Order IDs follow placement time, oldest history first
+        orders = pd.concat([seed.seed_order_history(), seed.seed_orders()], ignore_index=True)
+        orders['Order ID'] = np.arange(1, len(orders) + 1)
+        return {
+            "orders": orders,
+            "employees": seed.seed_employees(),
+            "kitchen_staff": seed.seed_kitchen_staff(),
+            "inventory": seed.seed_inventory(),
+            "feedback": seed.seed_feedback(),
+        }
+
+    @classmethod
+    def from_seed(cls):
+        """In-memory store populated from the seed tables"""
+        return cls(**cls._seed_tables())
+
+    @classmethod
+    def open(cls, path=DEFAULT_DATABASE_PATH):
+        """Store backed by SQLite; the seed tables are only written on first start"""
+        database = Database(path)
+        if database.is_empty():
+            tables = cls._seed_tables()
+            database.save_tables(tables)
+        else:
+            tables = database.load_tables()
+        return cls(**tables, database=database)
+
+    # Read-only snapshots. Callers must not mutate the returned frames.
+    @property
+    def orders(self):
+        with self._orders_lock:
+            return self._orders.frame()
+
+    @property
+    def employees(self):
+        return self._employees
+
+    @property
+    def kitchen_staff(self):
+        return self._kitchen_staff
+
+    @property
+    def inventory(self):
+        return self._inventory
+
+    @property
+    def feedback(self):
+        with self._feedback_lock:
+            return self._feedback.frame()
+
+    def get_order(self, order_id):
+        """Current values of a single order as a column -> value dict"""
+        with self._orders_lock:
+            row = self._order_rows[int(order_id)]
+            return {name: self._orders.get(row, name) for name in self._orders.columns}
+
+    def get_orders(self, order_ids, columns=None):
+        """Current values of many orders as a column -> array dict, in `order_ids` order, read in one take"""
+        with self._orders_lock:
+            rows = [self._order_rows[int(order_id)] for order_id in order_ids]
+            return self._orders.take(rows, columns)
+
+    def get_employee(self, name):
+        """Directory entry of an employee as a column -> value dict, or None"""
+        row = self._employee_rows.get(name)
+        return None if row is None else self._employees.iloc[row].to_dict()
+
+    def employee_orders(self, name, start=None):
+        """Orders placed by one employee, optionally only those at or after `start`"""
+        with self._orders_lock:
+            frame = self._orders.frame()
+            rows = np.asarray(self._employee_order_rows.get(name, ()), dtype=np.int64)
+            if start is not None:
+                rows = rows[self._orders.column('Placed At')[rows] >= pd.Timestamp(start).to_datetime64()]
+            return frame.iloc[rows]
+
+    def orders_since(self, start):
+        """Orders placed at or after `start`, in time order, found through the time index"""
+        with self._orders_lock:
+            rows = self._orders_by_time.since(pd.Timestamp(start).to_datetime64())
+            return self._orders.frame().iloc[rows]
+
+    # --------------------------------
+    # Rollups
+    # --------------------------------
+    def period_stats(self, time_filter):
+        """Dashboard counters for a reporting period, summed from the rollups"""
+        with self._orders_lock:
+            return self._rollups.totals_since(period_start(time_filter)).as_stats()
+
+    def hourly_stats(self, time_filter):
+        """Orders and revenue per hour of day over a reporting period"""
+        with self._orders_lock:
+            return self._rollups.hourly_since(period_start(time_filter), seed.OPENING_HOURS)
+
+    def daily_stats(self, time_filter):
+        """Orders and revenue per day over a reporting period"""
+        with self._orders_lock:
+            return self._rollups.daily_between(period_start(time_filter), datetime.now())
+
+    def staff_stats(self, time_filter):
+        """Dashboard counters per assigned staff member over a reporting period"""
+        with self._orders_lock:
+            return {staff: counters.as_stats()
+                    for staff, counters in self._rollups.staff_since(period_start(time_filter)).items()}
+
+    def demand_forecast(self, day, now=None):
+        """Expected orders per hour of `day`, after folding in the hours completed since the last call"""
+        with self._orders_lock:
+            until = pd.Timestamp(now or datetime.now()).floor('h')
+            through = self._forecast.through
+            hours = pd.date_range(pd.Timestamp(through if through is not None else until), until,
+                                  freq='h', inclusive='left')
+            counts = [self._rollups.hours[hour].total if hour in self._rollups.hours else 0 for hour in hours]
+            self._forecast.update(hours.values, counts, until)
+            return self._forecast.predict_day(day)
+
+    def _track(self, rows, book=True):
+        """Queue the outstanding orders among `rows` and book their prep time to their cooks; returns the cooks
+
+        With book=False the caller has already booked the work with the scheduler.
+        """
+        current = self._orders.take(rows, ('Order ID', 'Status', 'Assigned Staff', 'Priority', 'Item', 'Placed At'))
+        bookings = []
+        for order_id, status, staff, priority, item, placed_at in zip(*current.values()):
+            order_id = int(order_id)
+            if status not in OUTSTANDING_STATUSES:
+                self._kitchen_queue.remove(order_id)
+                continue
+            work = self._eta.prep_minutes(item)
+            bookings.append((staff, work))
+            self._booked[order_id] = (staff, priority, work)
+            self._staff_orders.setdefault(staff, set()).add(order_id)
+            self._kitchen_queue.push(order_id, status, priority, placed_at)
+        if book:
+            self._scheduler.add_many(bookings)
+        return {staff for staff, _ in bookings}
+
+    def _untrack(self, order_ids):
+        """Release the booked prep time of orders; returns the cooks they were booked to"""
+        released = []
+        for order_id in order_ids:
+            booked = self._booked.pop(order_id, None)
+            if booked is not None:
+                released.append((booked[0], booked[2]))
+                self._staff_orders[booked[0]].discard(order_id)
+        self._scheduler.release_many(released)
+        return {staff for staff, _ in released}
+
+    def _refresh_etas(self, staff):
+        """Recompute the ETAs of one cook's outstanding orders, writing only those that moved"""
+        order_ids = list(self._staff_orders.get(staff, ()))
+        rows = np.array([self._order_rows[order_id] for order_id in order_ids], dtype=np.int64)
+        current = self._orders.take(rows, ('Item', 'Status', 'Started At', 'ETA (min)'))
+        preparing = current['Status'] == 'preparing'
+        # Preparing orders first, then the queue in service order
+        order = sorted(range(len(rows)), key=lambda index: (not preparing[index],
+                                                            self._kitchen_queue.key(order_ids[index])))
+        etas = np.empty(len(rows), dtype=np.int64)
+        etas[order] = self._eta.queue_etas(zip(current['Item'][order], current['Status'][order],
+                                               current['Started At'][order]))
+        moved = etas != current['ETA (min)']
+        self._write_orders(rows[moved], {'ETA (min)': etas[moved]})
+
+    def _write_orders(self, rows, changes):
+        """Apply column changes (one value for all rows, or one per row) to the log, rollups and database
+
+        The rollups swap the rows' old values for their new ones in one pass,
+        and the database gets every row's UPDATE in one batch.
+        """
+        if len(rows) == 0:
+            return
+        changes = {column: values if np.ndim(values) else [values] * len(rows) for column, values in changes.items()}
+        old = self._orders.take(rows, ROLLUP_COLUMNS)
+        for column, values in changes.items():
+            self._orders.set_many(rows, column, values)
+        self._rollups.replace_frame(old, self._orders.take(rows, ROLLUP_COLUMNS))
+        if self._database is not None:
+            order_ids = self._orders.column('Order ID')[rows].tolist()
+            self._database.update_many("orders", "Order ID", [
+                (order_id, dict(zip(changes, values))) for order_id, *values in zip(order_ids, *changes.values())
+            ])
+
+    def queue_page(self, statuses, priorities, after=None, limit=10):
+        """Next page of outstanding orders in service order: (order IDs, cursor, has more)"""
+        with self._orders_lock:
+            return self._kitchen_queue.page(statuses, priorities, after=after, limit=limit)
+
+    def queue_count(self, statuses, priorities):
+        """Outstanding orders matching the kitchen queue filters"""
+        with self._orders_lock:
+            return self._kitchen_queue.count(statuses, priorities)
+
+    def _refresh_eligible(self):
+        # Eligibility follows shifts, so it is refreshed once an hour
+        hour = pd.Timestamp.now().floor('h')
+        if hour != self._schedule_hour:
+            self._scheduler.set_eligible(eligible_staff(self._kitchen_staff, hour))
+            self._schedule_hour = hour
+
+    def _assign_staff(self):
+        """Least-loaded eligible staff member for a new order"""
+        self._refresh_eligible()
+        return self._scheduler.choose()
+
+    def _bump(self, table):
+        with self._version_lock:
+            self.version += 1
+            self.versions[table] += 1
+
+    # --------------------------------
+    # Orders
+    # --------------------------------
+    def place_order(self, order):
+        """Append a new order and return its Order ID
+
+        Orders without an Assigned Staff go to the eligible staff member with
+        the least outstanding work. The ETA is
+        estimated from that cook's queue.
+        """
+        with self._orders_lock:
+            order_id = self._next_order_id
+            self._next_order_id += 1
+            row = {"Placed At": datetime.now(), "ETA (min)": 0, "Started At": np.nan, "Delivered At": np.nan,
+                   **order, "Order ID": order_id}
+            if row.get("Assigned Staff") is None:
+                row["Assigned Staff"] = self._assign_staff()
+            placed_at = pd.Timestamp(row["Placed At"]).to_datetime64()
+            self._order_rows[order_id] = self._orders.append(row)
+            self._orders_by_time.insert(placed_at, self._order_rows[order_id])
+            self._employee_order_rows.setdefault(row['Employee'], []).append(self._order_rows[order_id])
+            self._rollups.add(placed_at, row['Assigned Staff'], row['Status'], row['Cost'], row['ETA (min)'])
+            if self._database is not None:
+                self._database.insert("orders", row)
+            for staff in self._track([self._order_rows[order_id]]):
+                self._refresh_etas(staff)
+            self._bump("orders")
+        return order_id
+
+    def place_orders(self, orders):
+        """Append a batch of new orders (a DataFrame of order rows) and return their Order IDs
+
+        The batch is appended, rolled up and inserted into the database in one
+        pass each. Staff are assigned as in place_order(), one order after the
+        other so the load stays balanced, and each affected cook's ETAs are
+        refreshed once at the end.
+        """
+        with self._orders_lock:
+            if len(orders) == 0:
+                return []
+            batch = orders.reset_index(drop=True)
+            defaults = {"Placed At": datetime.now(), "ETA (min)": 0, "Started At": np.nan, "Delivered At": np.nan,
+                        "Assigned Staff": None}
+            batch = batch.assign(**{column: value for column, value in defaults.items() if column not in batch})
+            order_ids = np.arange(self._next_order_id, self._next_order_id + len(batch))
+            batch['Order ID'] = order_ids
+            batch['Placed At'] = pd.to_datetime(batch['Placed At'])
+            staff = batch['Assigned Staff'].to_numpy(dtype=object, copy=True)
+            positions = self._orders.extend(batch)
+            rows = np.arange(positions.start, positions.stop)
+            self._orders_by_time.extend(batch['Placed At'].to_numpy(), rows)
+            self._next_order_id += len(batch)
+            # Cooks are chosen one order after the other, each booking before the next choice
+            self._refresh_eligible()
+            work = [self._eta.prep_minutes(item) for item in batch['Item']]
+            for index, status in enumerate(batch['Status']):
+                if pd.isna(staff[index]):
+                    staff[index] = self._scheduler.choose()
+                if status in OUTSTANDING_STATUSES:
+                    self._scheduler.add(staff[index], work[index])
+            self._orders.set_many(rows, 'Assigned Staff', staff)
+            batch['Assigned Staff'] = staff
+            affected = self._track(rows, book=False)
+
+            self._order_rows.update(zip(order_ids.tolist(), rows.tolist()))
+            for name, indices in batch.groupby('Employee', observed=True, sort=False).indices.items():
+                self._employee_order_rows.setdefault(name, []).extend((indices + positions.start).tolist())
+            self._rollups.add_frame(batch)
+            if self._database is not None:
+                self._database.insert_many("orders", batch)
+            for cook in affected:
+                self._refresh_etas(cook)
+            self._bump("orders")
+        return order_ids.tolist()
+
+    def update_order(self, order_id, changes):
+        """Apply column changes to a single order, stamping status transitions"""
+        self.update_orders([order_id], changes)
+
+    def update_orders(self, order_ids, changes):
+        """Apply the same column changes to many orders at once, stamping status transitions
+
+        Log, rollups and database are written in one batch, the ingredients of
+        every order delivered by it leave stock in one inventory write, and each
+        affected cook's ETAs are refreshed once.
+        """
+        with self._orders_lock:
+            order_ids = list(dict.fromkeys(map(int, order_ids)))
+            rows = np.array([self._order_rows[order_id] for order_id in order_ids], dtype=np.int64)
+            status = changes.get('Status')
+            if status is None:
+                moved = np.zeros(len(rows), dtype=bool)
+            else:
+                moved = self._orders.take(rows, ('Status',))['Status'] != status
+            changes = {**self._transition_times(rows, status, moved), **changes}
+            affected = self._untrack(order_ids)
+            self._write_orders(rows, changes)
+            if status == 'delivered' and moved.any():
+                delivered = rows[moved]
+                self._record_prep(delivered)
+                self._consume(self._orders.take(delivered, ('Item',))['Item'])
+            affected |= self._track(rows)
+            for cook in affected:
+                self._refresh_etas(cook)
+            self._bump("orders")
+
+    def _transition_times(self, rows, status, moved):
+        """'Started At'/'Delivered At' epochs of rows whose status `moved` to `status`, keeping ones already recorded"""
+        if not moved.any():
+            return {}
+        now = epoch_seconds(datetime.now())
+        current = self._orders.take(rows, ('Started At', 'Delivered At'))
+        stamps = {}
+        if status in ('preparing', 'delivered'):
+            started = current['Started At']
+            stamps['Started At'] = np.where(moved & np.isnan(started), now, started)
+        if status == 'delivered':
+            stamps['Delivered At'] = np.where(moved, now, current['Delivered At'])
+        return stamps
+
+    def _record_prep(self, rows):
+        """Teach the ETA estimator the prep times of orders that were just delivered"""
+        done = self._orders.take(rows, ('Item', 'Started At', 'Delivered At'))
+        minutes = (done['Delivered At'] - done['Started At']) / 60
+        for item, prep in zip(done['Item'], minutes.tolist()):
+            self._eta.observe(item, prep)
+
+    # --------------------------------
+    # Inventory
+    # --------------------------------
+    def _set_stock_levels(self, stock_levels):
+        """Replace every stock level at once, recompute all statuses and write through the rows that moved
+
+        Rows whose stock went up were restocked, so their Last Order becomes today.
+        """
+        inventory = self._inventory.copy()
+        previous = inventory['Stock Level'].to_numpy()
+        changed = np.flatnonzero(previous != stock_levels)
+        if len(changed) == 0:
+            return
+        inventory['Stock Level'] = stock_levels
+        inventory['Status'] = stock_statuses(stock_levels, inventory['Threshold'].to_numpy())
+        inventory.loc[stock_levels > previous, 'Last Order'] = pd.Timestamp.now().normalize()
+        self._inventory = inventory
+        if self._database is not None:
+            self._database.update_many("inventory", "Item", [
+                (inventory['Item'].iat[row], {column: inventory[column].iat[row]
+                                              for column in ('Stock Level', 'Status', 'Last Order')})
+                for row in changed
+            ])
+        self._bump("inventory")
+
+    def _batch_stock(self, quantities, add):
+        """Set (or, with `add`, increase) the stock of many items in one write; returns unknown items"""
+        quantities = pd.Series(quantities, dtype=np.float64)
+        invalid = ~np.isfinite(quantities.to_numpy())
+        if invalid.any():
+            raise ValueError(f"Stock quantities must be numbers: {', '.join(map(str, quantities.index[invalid]))}")
+        with self._inventory_lock:
+            stock_levels = self._inventory['Stock Level'].to_numpy(dtype=np.float64, copy=True)
+            positions = pd.Index(self._inventory['Item']).get_indexer(quantities.index)
+            known = positions >= 0
+            if add:
+                np.add.at(stock_levels, positions[known], quantities.to_numpy()[known])
+            else:
+                stock_levels[positions[known]] = quantities.to_numpy()[known]
+            self._set_stock_levels(np.maximum(stock_levels, 0))
+        return quantities.index[~known].tolist()
+
+    def update_stock(self, item, stock_level):
+        """Set the stock level of an inventory item and refresh its status"""
+        self.update_stock_batch({item: stock_level})
+
+    def update_stock_batch(self, stock_levels):
+        """Set the stock levels of many items (item -> level) at once; returns items not in the inventory"""
+        return self._batch_stock(stock_levels, add=False)
+
+    def receive_stock(self, quantities):
+        """Add received quantities (item -> quantity) to stock at once; returns items not in the inventory"""
+        return self._batch_stock(quantities, add=True)
+
+    def _consume(self, items):
+        """Take the recipe ingredients of delivered menu items out of stock, as one batch"""
+        with self._inventory_lock:
+            used = consumption(items, self._inventory['Item'])
+            if used.any():
+                stock_levels = self._inventory['Stock Level'].to_numpy(dtype=np.float64)
+                self._set_stock_levels(np.maximum(stock_levels - used, 0))
+
+    # --------------------------------
+    # Feedback
+    # --------------------------------
+    def add_feedback(self, entry):
+        with self._feedback_lock:
+            self._feedback.append(entry)
+            if self._database is not None:
+                self._database.insert("feedback", entry)
+            self._bump("feedback")
@@ -0,0 +1,73 @@
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from persistence import TABLES, Database, _sql_value
+from store import OrderStore
+
+
+def test_reopen_after_writes(tmp_path):
+    path = str(tmp_path / "workplace.db")
+    store = OrderStore.open(path)
+    order_id = store.place_order({
+        "Item": "Latte", "Employee": store.employees['Name'].iloc[0], "Status": "queued",
+        "Priority": "normal", "Timestamp": datetime.now().strftime("%I:%M %p"), "Cost": 4.5,
+        "Message": "", "Rating": 0, "Delivery Method": "Staff",
+    })
+    store.update_order(order_id, {'Status': 'delivered', 'Delivery Method': 'Robot'})
+    store.add_feedback({"Employee": "A", "Staff Member": "B", "Rating": 5, "Comment": "", "Date": "2024-01-01"})
+    item = store.inventory['Item'].iloc[0]
+    store.update_stock(item, 12.5)
+    store._database.flush()
+
+    reopened = OrderStore.open(path)
+    order = reopened.get_order(order_id)
+    assert order['Status'] == 'delivered' and order['Delivery Method'] == 'Robot'
+    assert order['Placed At'] == store.get_order(order_id)['Placed At']
+    assert len(reopened.feedback) == len(store.feedback)
+    assert reopened.inventory.set_index('Item').loc[item, 'Stock Level'] == 12.5
+
+
+def _version_1_file(path):
+    """A database as the first SQLite release wrote it: no lifecycle columns, text Last Order"""
+    old_columns = {
+        "orders": [column for column in TABLES["orders"] if column[1] not in ("placed_at", "started_at", "delivered_at")],
+        "inventory": [column if column[1] not in ("stock_level", "last_order") else (column[0], column[1], "INTEGER" if column[1] == "stock_level" else "TEXT")
+                      for column in TABLES["inventory"]],
+    }
+    conn = sqlite3.connect(path)
+    with conn:
+        for table, columns in {**TABLES, **old_columns}.items():
+            conn.execute(f"CREATE TABLE {table} ({', '.join(f'{sql} {kind}' for _, sql, kind in columns)})")
+        tables = OrderStore._seed_tables()
+        for table, columns in old_columns.items():
+            if table == "inventory":
+                tables[table]["Last Order"] = ["2 days ago", "1 day ago", "Today", "3 days ago", "Today"]
+            frame = tables[table].head(50)
+            names = [sql for _, sql, _ in columns]
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})",
+                [tuple(_sql_value(value) for value in row) for row in frame[[name for name, _, _ in columns]].itertuples(index=False)],
+            )
+        for table in ("employees", "kitchen_staff", "feedback"):
+            # Layouts unchanged since version 1
+            conn.executemany(Database._insert_sql(table), list(Database._rows(table, tables[table])))
+        conn.execute("PRAGMA user_version = 1")
+    conn.close()
+
+
+def test_old_schema_is_migrated_not_dropped(tmp_path):
+    path = str(tmp_path / "workplace.db")
+    _version_1_file(path)
+    store = OrderStore.open(path)
+    assert len(store.orders) == 50
+    assert store.orders['Placed At'].notna().all()
+    assert store.orders['Started At'].isna().all()
+    last_order = store.inventory['Last Order']
+    today = pd.Timestamp.now().normalize()
+    assert list(today - last_order) == list(pd.to_timedelta([2, 1, 0, 3, 0], unit="D"))
+
+    store.update_stock(store.inventory['Item'].iloc[0], 2.5)
+    store._database.flush()
+    assert OrderStore.open(path).inventory['Stock Level'].iloc[0] == 2.5
@@ -0,0 +1,10 @@
+from recommend import RecommendationModel
+from store import OrderStore
+
+
+def test_model_builds_from_seeded_store():
+    store = OrderStore.from_seed()
+    model = RecommendationModel(store.orders)
+    employee = store.employees['Name'].iloc[-1]
+    assert model.affinity.shape[0] >= len(store.employees)
+    assert model.recommend(employee, 12)['favorite'] is not None
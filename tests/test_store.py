@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks import import_batch
+from stats import Rollups
+from store import OrderStore
+
+
+def _stats(table):
+    return {key: {name: round(value, 3) for name, value in counters.as_stats().items()}
+            for key, counters in table.items() if counters.total}
+
+
+def test_bulk_writes_match_a_rebuilt_store():
+    store = OrderStore.from_seed()
+    order_ids = store.place_orders(import_batch(500, np.random.default_rng(3)))
+    store.update_orders(order_ids[:300], {'Status': 'preparing'})
+    store.update_orders(order_ids[:100], {'Status': 'delivered', 'ETA (min)': 0, 'Delivery Method': 'Robot'})
+    store.update_orders(order_ids[200:250], {'Assigned Staff': 'Maria Santos'})
+
+    rollups = Rollups.from_frame(store.orders)
+    for table in ('hours', 'days', 'weeks', 'staff_days'):
+        assert _stats(getattr(store._rollups, table)) == _stats(getattr(rollups, table))
+    outstanding = store.orders[store.orders['Status'].isin(['queued', 'preparing'])]
+    assert {order_id: booked[:2] for order_id, booked in store._booked.items()} == dict(zip(
+        outstanding['Order ID'], zip(outstanding['Assigned Staff'], outstanding['Priority'])))
+    orders = store.orders.set_index('Order ID').loc[order_ids]
+    assert orders['Delivered At'].notna().sum() == 100
+    assert orders['Started At'].notna().sum() == 300
+
+
+def test_range_queries_see_out_of_order_rows():
+    store = OrderStore.from_seed()
+    now = pd.Timestamp.now()
+    placed = [now - pd.Timedelta(days=days) for days in (3, 10, 1)]
+    batch = import_batch(3, np.random.default_rng(5)).assign(**{'Placed At': placed, 'Employee': 'Sarah Chen'})
+    store.place_orders(batch)
+    store.place_order({**batch.iloc[0].to_dict(), 'Placed At': now - pd.Timedelta(days=5)})
+
+    start = now - pd.Timedelta(days=7)
+    expected = store.orders[store.orders['Placed At'] >= start]
+    since = store.orders_since(start)
+    assert sorted(since['Order ID']) == sorted(expected['Order ID'])
+    assert since['Placed At'].is_monotonic_increasing
+    mine = store.employee_orders('Sarah Chen', start)
+    assert sorted(mine['Order ID']) == sorted(expected.loc[expected['Employee'] == 'Sarah Chen', 'Order ID'])